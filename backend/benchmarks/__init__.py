@@ -0,0 +1,5 @@
+"""Benchmarks for the Error Log backend.
+
+Run from the ``backend`` directory, e.g. ``python -m benchmarks.query_count`` or
+``python -m benchmarks.api --output bench.json`` for the full API suite.
+"""
@@ -0,0 +1,215 @@
+"""Throughput, latency percentiles and peak memory for the main API operations.
+
+Seeds a synthetic dataset, then drives the ASGI app in-process with httpx for
+list, get, create, update, delete, file download and Word export. Each
+operation is timed over ``--iterations`` requests spread across
+``--concurrency`` workers, then run again under tracemalloc to record its
+peak Python heap usage. Results are written as JSON; pass ``--compare`` with
+an earlier result file to fail on p95 regressions.
+
+    python -m benchmarks.api --rows 2000 --file-kb 64 --output bench.json
+    python -m benchmarks.api --compare bench.json --max-regression 0.25
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import shutil
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import httpx
+
+from benchmarks.common import compare, isolated_backend, run_metadata, seed_errors, summarize, synthetic_description
+import main
+
+WARMUP_REQUESTS = 5
+
+
+class Dataset:
+    """Ids the operations draw from; creates feed the update and delete queues."""
+
+    def __init__(self, error_ids: list, file_ids: list, args: argparse.Namespace):
+        self.error_ids = error_ids
+        self.file_ids = file_ids
+        self.created: list = []
+        self.updates = itertools.count()
+        self.deletes = itertools.count()
+        self.args = args
+        self.payload = b"x" * (args.file_kb * 1024)
+        self.description = synthetic_description(0, args.description_kb * 1024)
+        # Seeded rows are one minute apart, so a time window selects a fixed number of records
+        start = datetime(2024, 1, 1)
+        self.export_query = (
+            f"created_from={start.isoformat()}"
+            f"&created_to={(start + timedelta(minutes=min(args.export_rows, args.rows))).isoformat()}"
+        )
+
+
+async def op_list(client: httpx.AsyncClient, data: Dataset, i: int):
+    return await client.get("/api/errors?limit=50")
+
+
+async def op_get(client: httpx.AsyncClient, data: Dataset, i: int):
+    return await client.get(f"/api/errors/{data.error_ids[i % len(data.error_ids)]}")
+
+
+async def op_create(client: httpx.AsyncClient, data: Dataset, i: int):
+    response = await client.post(
+        "/api/errors",
+        data={
+            "title": f"Benchmark error {i}",
+            "description": data.description,
+            "severity": "medium",
+            "status": "open",
+            "tags": json.dumps(["benchmark"]),
+        },
+        files={"files": (f"bench-{i}.log", data.payload, "text/plain")} if data.payload else None,
+    )
+    if response.status_code == 200:
+        data.created.append(response.json()["id"])
+    return response
+
+
+async def op_update(client: httpx.AsyncClient, data: Dataset, i: int):
+    error_id = data.created[next(data.updates) % len(data.created)]
+    return await client.put(
+        f"/api/errors/{error_id}",
+        data={
+            "title": f"Benchmark error {i} (updated)",
+            "description": data.description,
+            "severity": "high",
+            "status": "in-progress",
+            "tags": json.dumps(["benchmark", "updated"]),
+        },
+    )
+
+
+async def op_delete(client: httpx.AsyncClient, data: Dataset, i: int):
+    return await client.delete(f"/api/errors/{data.created[next(data.deletes)]}")
+
+
+async def op_file(client: httpx.AsyncClient, data: Dataset, i: int):
+    return await client.get(f"/api/files/{data.file_ids[i % len(data.file_ids)]}/download")
+
+
+async def op_export(client: httpx.AsyncClient, data: Dataset, i: int):
+    # Measure rendering, not the export cache
+    shutil.rmtree(main.EXPORT_CACHE_DIR, ignore_errors=True)
+    return await client.get(f"/api/export/word?{data.export_query}")
+
+
+# Order matters: creates supply the rows that updates and deletes consume
+OPERATIONS = [
+    ("list", op_list),
+    ("get", op_get),
+    ("create", op_create),
+    ("update", op_update),
+    ("delete", op_delete),
+    ("file_download", op_file),
+    ("word_export", op_export),
+]
+
+
+async def timed_run(client: httpx.AsyncClient, data: Dataset, operation, iterations: int, concurrency: int) -> dict:
+    latencies: list = []
+    counter = itertools.count()
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= iterations:
+                return
+            started = time.perf_counter()
+            response = await operation(client, data, i)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"throughput_ops": round(iterations / elapsed, 2), "latency": summarize(latencies)}
+
+
+async def memory_run(client: httpx.AsyncClient, data: Dataset, operation, iterations: int) -> int:
+    """Peak traced Python heap above the starting point, in KiB, over sequential requests."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(iterations):
+            (await operation(client, data, 10_000_000 + i)).raise_for_status()
+        return (tracemalloc.get_traced_memory()[1] - baseline) // 1024
+    finally:
+        tracemalloc.stop()
+
+
+async def run_suite(data: Dataset, args: argparse.Namespace) -> dict:
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for _ in range(WARMUP_REQUESTS):
+            await op_list(client, data, 0)
+            await op_get(client, data, 0)
+        for name, operation in OPERATIONS:
+            slow = name == "word_export"
+            iterations = args.export_iterations if slow else args.iterations
+            result = await timed_run(client, data, operation, iterations, 1 if slow else args.concurrency)
+            result["peak_memory_kb"] = await memory_run(client, data, operation, 1 if slow else args.memory_iterations)
+            results[name] = result
+            latency = result["latency"]
+            print(
+                f"{name:<14} {result['throughput_ops']:>9} ops/s  p50={latency['p50_ms']}ms "
+                f"p95={latency['p95_ms']}ms p99={latency['p99_ms']}ms  peak={result['peak_memory_kb']}KiB"
+            )
+    return results
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="Seeded errors")
+    parser.add_argument("--files-per-error", type=int, default=1)
+    parser.add_argument("--file-kb", type=int, default=16, help="Size of each attachment")
+    parser.add_argument("--description-kb", type=int, default=1, help="Size of each description")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed requests per operation")
+    parser.add_argument("--memory-iterations", type=int, default=20, help="Requests per operation under tracemalloc")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients per operation")
+    parser.add_argument("--export-rows", type=int, default=100, help="Records in each Word export")
+    parser.add_argument("--export-iterations", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier JSON results to check for p95 regressions")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed p95 growth as a fraction")
+    args = parser.parse_args()
+
+    workdir = isolated_backend()
+    try:
+        error_ids = seed_errors(args.rows, args.files_per_error, args.file_kb * 1024, args.description_kb * 1024)
+        with sqlite3.connect(main.DB_FILE) as conn:
+            file_ids = [row[0] for row in conn.execute("SELECT id FROM files")]
+        data = Dataset(error_ids, file_ids, args)
+        results = {
+            "meta": run_metadata(vars(args)),
+            "operations": asyncio.run(run_suite(data, args)),
+        }
+    finally:
+        main.shutdown_io_executor()
+        main.close_db_pool()
+        workdir.cleanup()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        regressions = compare(
+            results["operations"], args.compare, "operations",
+            lambda result: result["latency"]["p95_ms"], "p95", args.max_regression,
+        )
+        if regressions:
+            print(f"FAIL: p95 regressed beyond {args.max_regression:.0%} for {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,65 @@
+"""Regression check: errors exported in bulk must import back cleanly with ``upsert=true``.
+
+Exports tagged errors as NDJSON and CSV, re-imports each export over the same
+rows, then imports the NDJSON again with changed tags. Every row must be
+imported and the tag counts must follow. Exits non-zero otherwise.
+"""
+import json
+import sys
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import isolated_backend
+import main
+
+ROWS = 20
+
+
+def import_export(client: TestClient, fmt: str, body: bytes) -> list:
+    report = client.post(f"/api/errors/import?format={fmt}&upsert=true", content=body).json()
+    print(f"{fmt:<7} imported={report['imported']} failed={report['failed']}")
+    problems = [f"{fmt}: {error}" for error in report["errors"][:3]]
+    if report["imported"] != ROWS or report["failed"]:
+        problems.append(f"{fmt}: expected {ROWS} rows imported, got {report['imported']} ({report['failed']} failed)")
+    return problems
+
+
+def main_benchmark() -> int:
+    workdir = isolated_backend()
+    problems = []
+    try:
+        with TestClient(main.app) as client:
+            for i in range(ROWS):
+                client.post("/api/errors", data={
+                    "title": f"Round trip error {i}",
+                    "description": "Traceback",
+                    "severity": "low",
+                    "status": "open",
+                    "tags": json.dumps(["network", f"shard-{i % 2}"]),
+                }).raise_for_status()
+
+            for fmt in ("ndjson", "csv"):
+                problems += import_export(client, fmt, client.get(f"/api/errors/export?format={fmt}").content)
+
+            # Upserting changed tags goes through the update triggers instead of the insert ones
+            records = [json.loads(line) for line in client.get("/api/errors/export?format=ndjson").text.splitlines()]
+            for record in records:
+                record["tags"] = ["network", "retagged"]
+            problems += import_export(client, "ndjson", "".join(json.dumps(record) + "\n" for record in records).encode())
+
+            tags = {hit["tag"]: hit["count"] for hit in client.get("/api/tags").json()}
+            print(f"tags    {tags}")
+            if tags != {"network": ROWS, "retagged": ROWS}:
+                problems.append(f"tag counts after re-import are {tags}")
+    finally:
+        main.shutdown_io_executor()
+        main.close_db_pool()
+        workdir.cleanup()
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# main is imported where it is used: the startup benchmark shares these helpers
+# and must measure importing it in a fresh interpreter, not pay for it here
+
+
+def isolated_backend() -> tempfile.TemporaryDirectory:
+    """Point the backend at a fresh database and upload directory inside a temporary directory."""
+    import main
+
+    workdir = tempfile.TemporaryDirectory(prefix="logfix-bench-")
+    main.DB_FILE = os.path.join(workdir.name, "errors.db")
+    main.UPLOAD_DIR = os.path.join(workdir.name, "uploads")
+    os.makedirs(main.UPLOAD_DIR, exist_ok=True)
+    main.EXPORT_DIR = os.path.join(workdir.name, "exports")
+    main.EXPORT_CACHE_DIR = os.path.join(main.EXPORT_DIR, "cache")
+    main.EXPORT_DESKTOP_COPY = False
+    main.init_db()
+    return workdir
+
+
+def synthetic_description(i: int, size: int) -> str:
+    """A traceback-like description of roughly ``size`` characters."""
+    text = f"Traceback for synthetic error {i}"
+    frame = 0
+    while len(text) < size:
+        text += f'\n  File "/srv/app/module_{frame % 13}.py", line {frame * 7 + i % 50}, in handler_{frame % 5}'
+        frame += 1
+    return text
+
+
+def seed_errors(count: int, files_per_error: int = 1, file_size: int = 1024, description_size: int = 0) -> list:
+    """Insert ``count`` synthetic errors, each with ``files_per_error`` attachments of ``file_size`` bytes."""
+    import main
+
+    severities = ["critical", "high", "medium", "low"]
+    statuses = ["open", "in-progress", "resolved"]
+    start = datetime(2024, 1, 1)
+    error_ids = []
+    with sqlite3.connect(main.DB_FILE) as conn:
+        cursor = conn.cursor()
+        for i in range(count):
+            error_id = str(uuid.uuid4())
+            title = f"Synthetic error {i}"
+            description = synthetic_description(i, description_size)
+            timestamp = (start + timedelta(minutes=i)).isoformat()
+            cursor.execute(
+                "INSERT INTO errors (id, title, description, severity, category, tags, solution, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    error_id,
+                    title,
+                    description,
+                    severities[i % len(severities)],
+                    f"category-{i % 5}",
+                    json.dumps([f"tag-{i % 7}", "synthetic"]),
+                    "Restart the service",
+                    statuses[i % len(statuses)],
+                    timestamp,
+                    timestamp,
+                ),
+            )
+            # Fingerprinted here, as create_error does, so the startup backfill has nothing to do
+            main.store_fingerprint(conn, error_id, main.error_signature(title, description))
+            for j in range(files_per_error):
+                file_id = str(uuid.uuid4())
+                content = os.urandom(file_size)
+                digest = hashlib.sha256(content).hexdigest()
+                file_path = main.blob_path(digest)
+                with open(file_path, "wb") as f:
+                    f.write(content)
+                cursor.execute(
+                    "INSERT INTO files (id, error_id, filename, filepath, size, mimetype, sha256) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (file_id, error_id, f"attachment-{j}.log", file_path, file_size, "text/plain", digest),
+                )
+            error_ids.append(error_id)
+        conn.commit()
+    return error_ids
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list) -> dict:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=BACKEND_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_metadata(config: dict) -> dict:
+    """Where and how a benchmark ran, stored alongside its results."""
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "config": config,
+    }
+
+
+def compare(results: dict, baseline_path: str, section: str, metric, label: str, max_regression: float) -> list:
+    """Return the names in ``results`` whose ``metric`` grew by more than ``max_regression`` over the baseline.
+
+    ``section`` selects the same results in the baseline file; ``metric`` extracts a value in milliseconds.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)[section]
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = metric(baseline[name])
+        after = metric(result)
+        change = (after - before) / before if before else 0.0
+        print(f"{name:<15} {label} {before}ms -> {after}ms ({change:+.0%})")
+        if change > max_regression:
+            regressions.append(name)
+    return regressions
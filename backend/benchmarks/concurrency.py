@@ -0,0 +1,90 @@
+"""Read latency while large uploads are in flight.
+
+Drives the ASGI app in-process with httpx: readers repeatedly list errors
+while uploaders post multi-megabyte attachments. Prints p50/p95/p99 read
+latency with and without concurrent uploads; the two should stay close
+when blocking work is kept off the event loop.
+
+    python -m benchmarks.concurrency --upload-mb 32 --uploaders 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from benchmarks.common import isolated_backend, seed_errors, summarize
+import main
+
+
+async def reader(client: httpx.AsyncClient, requests: int, latencies: list):
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/errors?limit=50")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def uploader(client: httpx.AsyncClient, payload: bytes, uploads: int):
+    for i in range(uploads):
+        response = await client.post(
+            "/api/errors",
+            data={
+                "title": f"Upload benchmark {i}",
+                "description": "Large log bundle",
+                "severity": "low",
+                "status": "open",
+                "tags": "[]",
+            },
+            files={"files": ("bundle.log", payload, "text/plain")},
+        )
+        response.raise_for_status()
+
+
+async def run_phase(readers: int, reads: int, uploaders: int, uploads: int, payload: bytes) -> dict:
+    latencies: list = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        tasks = [reader(client, reads, latencies) for _ in range(readers)]
+        tasks += [uploader(client, payload, uploads) for _ in range(uploaders)]
+        await asyncio.gather(*tasks)
+    return summarize(latencies)
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--reads", type=int, default=50)
+    parser.add_argument("--uploaders", type=int, default=4)
+    parser.add_argument("--uploads", type=int, default=3)
+    parser.add_argument("--upload-mb", type=int, default=32)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = isolated_backend()
+    try:
+        seed_errors(args.rows, files_per_error=1, file_size=512)
+        payload = os.urandom(args.upload_mb * 1024 * 1024)
+        results = {
+            "idle": asyncio.run(run_phase(args.readers, args.reads, 0, 0, payload)),
+            "under_upload": asyncio.run(run_phase(args.readers, args.reads, args.uploaders, args.uploads, payload)),
+            "config": vars(args),
+        }
+    finally:
+        main.shutdown_io_executor()
+        main.close_db_pool()
+        workdir.cleanup()
+
+    for phase in ("idle", "under_upload"):
+        stats = results[phase]
+        print(f"{phase:<13} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_benchmark()
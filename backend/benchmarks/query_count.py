@@ -0,0 +1,81 @@
+"""Regression benchmark: list and export must issue a constant number of SQL queries.
+
+Counts connections and statements while ``GET /api/errors`` and
+``GET /api/export/word`` run against databases of growing size, and exits
+non-zero if the count grows with the number of rows.
+"""
+import sqlite3
+import sys
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import isolated_backend, seed_errors
+import main
+
+SIZES = [10, 50, 200]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.connections = 0
+        self.statements = 0
+        self._connect = sqlite3.connect
+
+    def _trace(self, statement: str):
+        # Only statements issued on behalf of a request count; background jobs such as
+        # the fingerprint backfill run outside any request context
+        if main.current_trace.get() is None:
+            return
+        if statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+            self.statements += 1
+
+    def connect(self, *args, **kwargs):
+        conn = self._connect(*args, **kwargs)
+        conn.set_trace_callback(self._trace)
+        if main.current_trace.get() is not None:
+            self.connections += 1
+        return conn
+
+    def __enter__(self):
+        self.connections = 0
+        self.statements = 0
+        # Start from an empty pool so every connection used is created, and traced, here
+        main.close_db_pool()
+        sqlite3.connect = self.connect
+        return self
+
+    def __exit__(self, *exc):
+        sqlite3.connect = self._connect
+
+
+def measure(client: TestClient, path: str) -> tuple:
+    with QueryCounter() as counter:
+        response = client.get(path)
+        response.raise_for_status()
+    return counter.connections, counter.statements
+
+
+def main_benchmark() -> int:
+    results = {"list": [], "export": []}
+    for size in SIZES:
+        workdir = isolated_backend()
+        try:
+            seed_errors(size, files_per_error=2, file_size=256)
+            with TestClient(main.app) as client:
+                results["list"].append(measure(client, "/api/errors?limit=200"))
+                results["export"].append(measure(client, "/api/export/word"))
+        finally:
+            workdir.cleanup()
+
+    failed = False
+    for name, counts in results.items():
+        for size, (connections, statements) in zip(SIZES, counts):
+            print(f"{name:<7} rows={size:<5} connections={connections:<3} statements={statements}")
+        if len(set(counts)) != 1:
+            print(f"FAIL: {name} query count grows with row count: {counts}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
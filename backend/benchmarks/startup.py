@@ -0,0 +1,170 @@
+"""Cold-start cost of the backend: import time and time to the first served request.
+
+Each run starts fresh interpreters, so nothing is cached in-process between
+runs. ``import`` is the wall time of ``import main`` as reported by
+``-X importtime``. ``first_response`` is the time from launching uvicorn to
+the first successful ``GET /api/errors``. ``first_request`` is the latency of
+that request alone. ``first_export`` is the first Word export afterwards,
+which pays for loading python-docx if the background preload has not
+finished. The slowest imports of the last run are listed to show where
+import time goes. Pass ``--compare`` with an earlier result file to fail on
+regressions.
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+    python -m benchmarks.startup --compare startup.json --max-regression 0.25
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.common import BACKEND_DIR, compare, run_metadata
+
+STARTUP_TIMEOUT_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.01
+TOP_IMPORTS = 15
+
+
+def isolated_env(workdir: str) -> dict:
+    """Environment pointing a backend process at empty storage inside ``workdir``."""
+    env = dict(os.environ)
+    env.update({
+        "DB_FILE": os.path.join(workdir, "errors.db"),
+        "UPLOAD_DIR": os.path.join(workdir, "uploads"),
+        "EXPORT_DIR": os.path.join(workdir, "exports"),
+        "EXPORT_DESKTOP_COPY": "0",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    })
+    return env
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self µs, cumulative µs) rows from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_import(env: dict) -> tuple:
+    """Return (seconds to import main, slowest imports by self time)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    total = next(cumulative for module, _, cumulative in reversed(rows) if module == "main")
+    slowest = sorted(rows, key=lambda row: -row[1])[:TOP_IMPORTS]
+    return total / 1_000_000, [{"module": module, "self_ms": round(self_us / 1000, 3)} for module, self_us, _ in slowest]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def timed_get(url: str) -> float:
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=STARTUP_TIMEOUT_SECONDS) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def measure_first_request(env: dict) -> dict:
+    """Launch uvicorn on the app and time how long it takes to serve its first requests."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    launched = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {server.returncode} before serving a request")
+            if time.perf_counter() - launched > STARTUP_TIMEOUT_SECONDS:
+                raise RuntimeError(f"Server did not answer within {STARTUP_TIMEOUT_SECONDS}s")
+            try:
+                first_request = timed_get(f"{base_url}/api/errors")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(POLL_INTERVAL_SECONDS)
+        first_response = time.perf_counter() - launched
+        first_export = timed_get(f"{base_url}/api/export/word")
+    finally:
+        server.terminate()
+        server.wait()
+    return {"first_response": first_response, "first_request": first_request, "first_export": first_export}
+
+
+def summarize_runs(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def run_suite(runs: int) -> dict:
+    samples = {"import": [], "first_response": [], "first_request": [], "first_export": []}
+    slowest_imports = []
+    for run in range(runs):
+        with tempfile.TemporaryDirectory(prefix="logfix-startup-") as workdir:
+            env = isolated_env(workdir)
+            import_seconds, slowest_imports = measure_import(env)
+            samples["import"].append(import_seconds)
+            for name, seconds in measure_first_request(env).items():
+                samples[name].append(seconds)
+        print(
+            f"run {run + 1}: import={import_seconds * 1000:.1f}ms "
+            f"first_response={samples['first_response'][-1] * 1000:.1f}ms "
+            f"first_request={samples['first_request'][-1] * 1000:.1f}ms "
+            f"first_export={samples['first_export'][-1] * 1000:.1f}ms"
+        )
+    return {
+        "phases": {name: summarize_runs(values) for name, values in samples.items()},
+        "slowest_imports": slowest_imports,
+    }
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier JSON results to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed median growth as a fraction")
+    args = parser.parse_args()
+
+    results = {
+        "meta": run_metadata(vars(args)),
+        **run_suite(args.runs),
+    }
+    print("slowest imports: " + ", ".join(f"{row['module']} {row['self_ms']}ms" for row in results["slowest_imports"][:5]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        regressions = compare(
+            results["phases"], args.compare, "phases", lambda result: result["median_ms"], "median", args.max_regression
+        )
+        if regressions:
+            print(f"FAIL: startup regressed beyond {args.max_regression:.0%} for {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_benchmark()
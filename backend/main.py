@@ -2,33 +2,244 @@ import asyncio
 import subprocess
 import sys
 import os
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Request, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 import sqlite3
 import shutil
+import queue
+import threading
+import contextvars
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from collections import deque
+from array import array
 from pathlib import Path
 import uuid
 import json
 import logging
 import base64
-from docx import Document
-from docx.shared import Inches, Cm
-from io import BytesIO
-import uvicorn
-import webbrowser
-import webview
-import signal
+import gzip
+import hashlib
+import mimetypes
+import re
+import csv
+import io
+import struct
+import tempfile
+import time
+import zipfile
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
+from xml.sax.saxutils import escape as xml_escape
+# python-docx, Pillow, uvicorn and pywebview are imported where they are used, so importing
+# this module (and starting the desktop app) does not pay for them up front
 
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Instrumentation: Prometheus-format metrics plus a per-request breakdown of where time went.
+# Metrics are kept per process.
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", 0))  # 0 disables the slow-request log
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+SQL_KEYWORDS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "CREATE"}
+
+class Metric:
+    """A Prometheus counter or histogram with a fixed set of label names."""
+
+    def __init__(self, name: str, help_text: str, kind: str, labels: tuple = (), buckets: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labels = labels
+        self.buckets = buckets
+        self.values: dict = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1.0):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def observe(self, labels: tuple, value: float):
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _labels(self, values: tuple, le: Optional[str] = None) -> str:
+        pairs = list(zip(self.labels, values))
+        if le is not None:
+            pairs.append(("le", le))
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            items = sorted(self.values.items())
+            for labels, state in items:
+                if self.kind == "counter":
+                    lines.append(f"{self.name}{self._labels(labels)} {state}")
+                    continue
+                counts, total, count = state
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{self._labels(labels, str(bound))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{self._labels(labels, '+Inf')} {count}")
+                lines.append(f"{self.name}_sum{self._labels(labels)} {total}")
+                lines.append(f"{self.name}_count{self._labels(labels)} {count}")
+        return lines
+
+http_request_duration = Metric(
+    "logfix_http_request_duration_seconds", "HTTP request latency by route template.", "histogram",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+http_request_queries = Metric(
+    "logfix_http_request_db_queries", "SQL statements issued per HTTP request.", "histogram", ("route",), COUNT_BUCKETS,
+)
+db_query_duration = Metric(
+    "logfix_db_query_duration_seconds", "SQLite statement execution time by statement type.", "histogram",
+    ("statement",), QUERY_BUCKETS,
+)
+upload_dir_bytes = Metric(
+    "logfix_upload_dir_bytes_total", "Bytes read from and written to UPLOAD_DIR.", "counter", ("direction",),
+)
+phase_duration = Metric(
+    "logfix_phase_duration_seconds", "Time spent in instrumented phases such as export build steps and base64 encoding.",
+    "histogram", ("phase",), LATENCY_BUCKETS,
+)
+METRICS = [http_request_duration, http_request_queries, db_query_duration, upload_dir_bytes, phase_duration]
+
+class RequestTrace:
+    """Per-request accumulator for SQL, disk and phase timings; phases may nest, so they can overlap."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.queries = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+
+@contextmanager
+def timed_phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        phase_duration.observe((name,), elapsed)
+        trace = current_trace.get()
+        if trace is not None:
+            trace.add(name, elapsed)
+
+def record_query(sql: str, seconds: float):
+    keyword = sql.lstrip()[:8].split(None, 1)[0].upper() if sql.strip() else ""
+    db_query_duration.observe((keyword if keyword in SQL_KEYWORDS else "OTHER",), seconds)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.queries += 1
+        trace.add("sql", seconds)
+
+def record_upload_io(direction: str, size: int):
+    """Count bytes moved to or from UPLOAD_DIR; direction is 'read' or 'written'."""
+    upload_dir_bytes.inc((direction,), size)
+    trace = current_trace.get()
+    if trace is not None:
+        if direction == "read":
+            trace.bytes_read += size
+        else:
+            trace.bytes_written += size
+
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_query(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_query(sql, time.perf_counter() - started)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements are timed; row fetching after the first step is not included."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording latency and query counts per route, and logging slow requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_trace.reset(token)
+            route = scope.get("route")
+            # Route templates keep label cardinality bounded; unmatched paths share one label
+            path = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe((scope["method"], path, str(status)), elapsed)
+            http_request_queries.observe((path,), trace.queries)
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                log_slow_request(scope["method"], scope["path"], status, elapsed, trace)
+
+def log_slow_request(method: str, path: str, status: int, elapsed: float, trace: RequestTrace):
+    phases = ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in sorted(trace.phases.items(), key=lambda item: -item[1]))
+    logger.warning(
+        f"Slow request {method} {path} {status} in {elapsed * 1000:.1f}ms: "
+        f"{trace.queries} queries, {trace.bytes_read} bytes read, {trace.bytes_written} bytes written"
+        f"{'; ' + phases if phases else ''}"
+    )
+
 app = FastAPI()
+app.add_middleware(RequestMetricsMiddleware)
 
 # CORS middleware to allow frontend communication
 app.add_middleware(
@@ -37,21 +248,244 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Content-Range", "Content-Length", "Accept-Ranges", "ETag", "Last-Modified", "Content-Disposition", "Upload-Offset"],
 )
 
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    # Every worker runs this; the lock keeps concurrent workers from migrating at the same time
+    with startup_lock():
+        init_db()
+        deduplicate_uploads()
+    schedule_fingerprint_backfill()
+    schedule_storage_maintenance()
+    # Requests are served as soon as the schema is ready; export and image support load behind them
+    threading.Thread(target=preload_optional_modules, name="preload", daemon=True).start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    change_feed.stop()
+    storage_maintenance_stop.set()
+    shutdown_io_executor()
+    close_db_pool()
+
+# Heavy modules only some endpoints need, warmed in the background after startup
+OPTIONAL_MODULES = ("docx", "docx.image.image")
+
+def preload_optional_modules():
+    started = time.perf_counter()
+    for name in OPTIONAL_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning(f"Optional module {name} is unavailable: {str(e)}")
+    load_pillow()
+    logger.debug(f"Loaded optional modules in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+@app.get("/metrics")
+async def get_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return Response("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # Database setup
-DB_FILE = "errors.db"
+DB_FILE = os.environ.get("DB_FILE", "errors.db")
 # Use an absolute path for the upload directory
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
-Path(UPLOAD_DIR).mkdir(exist_ok=True)
+UPLOAD_DIR = os.path.abspath(os.environ.get("UPLOAD_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads"))
+Path(UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+# Attachments up to this size may be inlined as base64 when a client passes include_content=true
+INLINE_CONTENT_MAX_BYTES = int(os.environ.get("INLINE_CONTENT_MAX_BYTES", 64 * 1024))
+
+# Connection pool settings
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+DB_STATEMENT_CACHE_SIZE = 256
+
+class ConnectionPool:
+    """A bounded pool of SQLite connections configured for concurrent use.
+
+    Connections run in WAL mode with ``synchronous=NORMAL``, a busy timeout and
+    foreign keys enabled. ``connection()`` is re-entrant per thread, so helpers
+    called while a connection is held reuse it instead of taking another one.
+    """
+
+    def __init__(self, db_file: str, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT):
+        self.db_file = db_file
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
+            factory=InstrumentedConnection,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        logger.debug(f"Opened pooled connection to {self.db_file}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a database connection")
+
+    def _release(self, conn: sqlite3.Connection):
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._release(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_db_pool: Optional[ConnectionPool] = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool() -> ConnectionPool:
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool.db_file != DB_FILE:
+            if _db_pool is not None:
+                _db_pool.close()
+            _db_pool = ConnectionPool(DB_FILE)
+        return _db_pool
+
+def close_db_pool():
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is not None:
+            _db_pool.close()
+            _db_pool = None
+
+def db_connection():
+    return get_db_pool().connection()
+
+# Blocking SQLite, disk and document work runs here instead of on the event loop.
+# Sized to the connection pool so workers never queue for a connection.
+IO_WORKERS = int(os.environ.get("IO_WORKERS", DB_POOL_SIZE))
+# Bulk imports block on the client's upload for as long as it lasts, so they get workers of
+# their own; a few slow uploads can then never take the workers request handlers need
+IMPORT_WORKERS = int(os.environ.get("IMPORT_WORKERS", 2))
+# Word exports decode and resize images for their whole run, so they are bounded separately too
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", 2))
+_executors: Dict[str, ThreadPoolExecutor] = {}
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    executor = _executors.get(name)
+    if executor is None:
+        executor = _executors[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    return executor
+
+def get_io_executor() -> ThreadPoolExecutor:
+    return get_executor("io", IO_WORKERS)
+
+def get_import_executor() -> ThreadPoolExecutor:
+    return get_executor("import", IMPORT_WORKERS)
+
+def get_export_executor() -> ThreadPoolExecutor:
+    return get_executor("export", EXPORT_WORKERS)
+
+def shutdown_io_executor():
+    """Shut down the I/O executor and every job executor, waiting for running work."""
+    while _executors:
+        _executors.popitem()[1].shutdown(wait=True)
+
+async def run_in(executor: ThreadPoolExecutor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # Carry the request's context into the worker so its SQL and disk work is attributed to it
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, partial(context.run, func, *args, **kwargs))
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking data-access or file-storage call on the I/O executor and await its result."""
+    return await run_in(get_io_executor(), func, *args, **kwargs)
+
+# How long a worker waits for another worker's schema setup and migrations to finish
+STARTUP_LOCK_TIMEOUT = float(os.environ.get("STARTUP_LOCK_TIMEOUT", 600))
+
+@contextmanager
+def process_lock(suffix: str, timeout: float):
+    """Hold a lock shared by every process using DB_FILE.
+
+    The lock is an exclusive transaction on a small side database next to DB_FILE,
+    which behaves the same on every platform SQLite runs on. Raises TimeoutError
+    if the lock is still held elsewhere after ``timeout`` seconds.
+    """
+    lock = sqlite3.connect(f"{DB_FILE}.{suffix}", timeout=timeout, isolation_level=None)
+    try:
+        try:
+            lock.execute("BEGIN EXCLUSIVE")
+        except sqlite3.OperationalError as e:
+            raise TimeoutError(f"{DB_FILE}.{suffix} is held by another process") from e
+        try:
+            yield
+        finally:
+            lock.execute("ROLLBACK")
+    finally:
+        lock.close()
+
+def startup_lock():
+    """Serialize schema setup and migrations across worker processes."""
+    return process_lock("lock", STARTUP_LOCK_TIMEOUT)
 
 def init_db():
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS errors (
@@ -75,15 +509,384 @@ def init_db():
                     filepath TEXT NOT NULL,
                     size INTEGER NOT NULL,
                     mimetype TEXT NOT NULL,
+                    sha256 TEXT,
                     FOREIGN KEY (error_id) REFERENCES errors(id) ON DELETE CASCADE
                 )
             """)
+            # encoding is NULL for blobs stored as-is and 'gzip' for compressed ones
+            add_missing_columns(cursor, "files", {"sha256": "TEXT", "encoding": "TEXT"})
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    mimetype TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    received INTEGER NOT NULL DEFAULT 0,
+                    sha256 TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            # Indexes backing keyset pagination and the list filters
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_errors_created ON errors (created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_errors_updated ON errors (updated_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_errors_severity_created ON errors (severity, created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_errors_status_created ON errors (status, created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_errors_category_created ON errors (category, created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_error_id ON files (error_id)")
+            # Blob reference counts are the number of files rows pointing at a path
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_filepath ON files (filepath)")
+            init_search_index(cursor)
+            init_error_stats(cursor)
+            init_tag_index(cursor)
+            init_change_tracking(cursor)
+            init_similarity_index(cursor)
+            init_export_jobs(cursor)
             conn.commit()
             logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
+def add_missing_columns(cursor: sqlite3.Cursor, table: str, columns: dict):
+    """Add columns introduced after a table was first created to existing databases."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    for name, definition in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+            logger.info(f"Added column {table}.{name}")
+
+def init_search_index(cursor: sqlite3.Cursor):
+    """Create the FTS5 index over errors, its sync triggers, and backfill it on first creation."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'errors_fts'")
+    exists = cursor.fetchone() is not None
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS errors_fts USING fts5(
+            title, description, solution, tags,
+            content='errors', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS errors_fts_insert AFTER INSERT ON errors BEGIN
+            INSERT INTO errors_fts (rowid, title, description, solution, tags)
+            VALUES (new.rowid, new.title, new.description, new.solution, new.tags);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS errors_fts_delete AFTER DELETE ON errors BEGIN
+            INSERT INTO errors_fts (errors_fts, rowid, title, description, solution, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.solution, old.tags);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS errors_fts_update AFTER UPDATE ON errors BEGIN
+            INSERT INTO errors_fts (errors_fts, rowid, title, description, solution, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.solution, old.tags);
+            INSERT INTO errors_fts (rowid, title, description, solution, tags)
+            VALUES (new.rowid, new.title, new.description, new.solution, new.tags);
+        END
+    """)
+    if not exists:
+        # One-time backfill for databases created before the search index existed
+        cursor.execute("INSERT INTO errors_fts (errors_fts) VALUES ('rebuild')")
+        logger.info("Built full-text search index for existing errors")
+
+# Per-row contributions to the error_stats counters; the triggers add them for new rows and
+# subtract them for old ones. The WHERE clauses keep the upsert unambiguous after a FROM.
+# Tag counts are not among them: tags.error_count is their single source.
+STATS_CONTRIBUTIONS = [
+    "SELECT 'severity', {row}.severity, 1, 0 WHERE true",
+    "SELECT 'status', {row}.status, 1, 0 WHERE true",
+    "SELECT 'category', COALESCE(NULLIF({row}.category, ''), 'uncategorized'), 1, 0 WHERE true",
+    "SELECT 'opened', date({row}.created_at), 1, 0 WHERE true",
+    "SELECT 'resolved', date({row}.resolved_at), 1, julianday({row}.resolved_at) - julianday({row}.created_at) WHERE {row}.resolved_at IS NOT NULL",
+    "SELECT 'resolution', '', 1, julianday({row}.resolved_at) - julianday({row}.created_at) WHERE {row}.resolved_at IS NOT NULL",
+]
+
+STATS_BACKFILL = """
+    INSERT INTO error_stats (metric, key, count, total)
+    SELECT 'severity', severity, COUNT(*), 0 FROM errors GROUP BY severity
+    UNION ALL
+    SELECT 'status', status, COUNT(*), 0 FROM errors GROUP BY status
+    UNION ALL
+    SELECT 'category', COALESCE(NULLIF(category, ''), 'uncategorized'), COUNT(*), 0
+    FROM errors GROUP BY COALESCE(NULLIF(category, ''), 'uncategorized')
+    UNION ALL
+    SELECT 'opened', date(created_at), COUNT(*), 0 FROM errors GROUP BY date(created_at)
+    UNION ALL
+    SELECT 'resolved', date(resolved_at), COUNT(*), TOTAL(julianday(resolved_at) - julianday(created_at))
+    FROM errors WHERE resolved_at IS NOT NULL GROUP BY date(resolved_at)
+    UNION ALL
+    SELECT 'resolution', '', COUNT(*), TOTAL(julianday(resolved_at) - julianday(created_at))
+    FROM errors WHERE resolved_at IS NOT NULL
+"""
+
+def stats_trigger_body(row: str, sign: str) -> str:
+    return "\n".join(
+        f"INSERT INTO error_stats (metric, key, count, total) {select.format(row=row)} "
+        f"ON CONFLICT (metric, key) DO UPDATE SET count = count {sign} excluded.count, total = total {sign} excluded.total;"
+        for select in STATS_CONTRIBUTIONS
+    )
+
+def init_error_stats(cursor: sqlite3.Cursor):
+    """Create the aggregate counters behind /api/stats, their triggers, and backfill them on first creation."""
+    add_missing_columns(cursor, "errors", {"resolved_at": "TEXT"})
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'error_stats'")
+    exists = cursor.fetchone() is not None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS error_stats (
+            metric TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, key)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_stats_count ON error_stats (metric, count)")
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'errors_stats_insert'")
+    trigger = cursor.fetchone()
+    if trigger and "'tag'" in trigger[0]:
+        # Tag counters moved to tags.error_count; recreate the triggers below without them
+        for name in ("errors_stats_insert", "errors_stats_delete", "errors_stats_update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute("DELETE FROM error_stats WHERE metric = 'tag'")
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS errors_stats_insert AFTER INSERT ON errors BEGIN
+            {stats_trigger_body("new", "+")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS errors_stats_delete AFTER DELETE ON errors BEGIN
+            {stats_trigger_body("old", "-")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS errors_stats_update
+        AFTER UPDATE OF severity, status, category, tags, created_at, resolved_at ON errors BEGIN
+            {stats_trigger_body("old", "-")}
+            {stats_trigger_body("new", "+")}
+        END
+    """)
+    if not exists:
+        # Resolution times were not recorded before, so the last update of a resolved error stands in
+        cursor.execute("UPDATE errors SET resolved_at = updated_at WHERE status = 'resolved' AND resolved_at IS NULL")
+        cursor.execute("DELETE FROM error_stats")
+        cursor.execute(STATS_BACKFILL)
+        logger.info("Built aggregate statistics for existing errors")
+
+def init_tag_index(cursor: sqlite3.Cursor):
+    """Create the normalized tags/error_tags tables, their sync triggers, and migrate the JSON tags column."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tags'")
+    exists = cursor.fetchone() is not None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            error_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS error_tags (
+            error_id TEXT NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (error_id, tag_id),
+            FOREIGN KEY (error_id) REFERENCES errors(id) ON DELETE CASCADE,
+            FOREIGN KEY (tag_id) REFERENCES tags(id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_tags_tag ON error_tags (tag_id, error_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_name_nocase ON tags (name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_count ON tags (error_count, name)")
+    if not exists:
+        # One-time migration of the JSON tags column, before the counting triggers exist
+        cursor.execute("""
+            INSERT OR IGNORE INTO tags (name)
+            SELECT DISTINCT tag.value FROM errors AS e, json_each(COALESCE(e.tags, '[]')) AS tag
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO error_tags (error_id, tag_id)
+            SELECT e.id, t.id FROM errors AS e, json_each(COALESCE(e.tags, '[]')) AS tag JOIN tags AS t ON t.name = tag.value
+        """)
+        cursor.execute("UPDATE tags SET error_count = (SELECT COUNT(*) FROM error_tags WHERE tag_id = tags.id)")
+        logger.info("Migrated error tags into the tags table")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS error_tags_count_insert AFTER INSERT ON error_tags BEGIN
+            UPDATE tags SET error_count = error_count + 1 WHERE id = new.tag_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS error_tags_count_delete AFTER DELETE ON error_tags BEGIN
+            UPDATE tags SET error_count = error_count - 1 WHERE id = old.tag_id;
+            DELETE FROM tags WHERE id = old.tag_id AND error_count <= 0;
+        END
+    """)
+    # A trigger's OR IGNORE is overridden by the conflict policy of the statement that fired it
+    # (the bulk import's upsert among them), so these use upsert clauses, which are always honoured
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'errors_tags_insert'")
+    trigger = cursor.fetchone()
+    if trigger and "OR IGNORE" in trigger[0]:
+        cursor.execute("DROP TRIGGER IF EXISTS errors_tags_insert")
+        cursor.execute("DROP TRIGGER IF EXISTS errors_tags_update")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS errors_tags_insert AFTER INSERT ON errors BEGIN
+            INSERT INTO tags (name) SELECT value FROM json_each(COALESCE(new.tags, '[]')) WHERE true
+            ON CONFLICT (name) DO NOTHING;
+            INSERT INTO error_tags (error_id, tag_id)
+            SELECT new.id, tags.id FROM json_each(COALESCE(new.tags, '[]')) AS tag JOIN tags ON tags.name = tag.value WHERE true
+            ON CONFLICT (error_id, tag_id) DO NOTHING;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS errors_tags_update AFTER UPDATE OF tags ON errors BEGIN
+            INSERT INTO tags (name) SELECT value FROM json_each(COALESCE(new.tags, '[]')) WHERE true
+            ON CONFLICT (name) DO NOTHING;
+            DELETE FROM error_tags WHERE error_id = old.id AND tag_id NOT IN (
+                SELECT tags.id FROM json_each(COALESCE(new.tags, '[]')) AS tag JOIN tags ON tags.name = tag.value
+            );
+            INSERT INTO error_tags (error_id, tag_id)
+            SELECT new.id, tags.id FROM json_each(COALESCE(new.tags, '[]')) AS tag JOIN tags ON tags.name = tag.value WHERE true
+            ON CONFLICT (error_id, tag_id) DO NOTHING;
+        END
+    """)
+
+# Filterable fields as they were before a change, so the feed can tell a client that an error
+# left its filter without telling every client about every change
+PREVIOUS_FIELDS = ("severity", "status", "category", "tags")
+# Changes kept in the error_events log; feed clients further behind get each error's latest change instead
+FEED_EVENT_LOG_SIZE = 10000
+CHANGE_TRIGGERS = ("errors_changes_insert", "errors_changes_update", "errors_changes_delete",
+                   "files_changes_insert", "files_changes_update", "files_changes_delete")
+
+def change_trigger_body(error_id: str, event: str, changed_at: str, previous: Iterable[str]) -> str:
+    """SQL recording a change; previous holds one expression per PREVIOUS_FIELDS for the state before it.
+
+    error_changes keeps each error's latest change for ETags and delta sync. error_events
+    appends every change, so the feed can report each one, and drops the oldest beyond
+    FEED_EVENT_LOG_SIZE.
+    """
+    columns = ", ".join(f"previous_{field}" for field in PREVIOUS_FIELDS)
+    updates = ", ".join(f"previous_{field} = excluded.previous_{field}" for field in PREVIOUS_FIELDS)
+    previous = ", ".join(previous)
+    return f"""
+            UPDATE sync_state SET version = version + 1 WHERE id = 1;
+            INSERT INTO error_changes (error_id, version, deleted, changed_at, event, {columns})
+            SELECT {error_id}, version, {int(event == "deleted")}, {changed_at}, '{event}', {previous}
+            FROM sync_state WHERE id = 1
+            ON CONFLICT (error_id) DO UPDATE SET
+                version = excluded.version, deleted = excluded.deleted, changed_at = excluded.changed_at,
+                event = excluded.event, {updates};
+            INSERT INTO error_events (version, error_id, event, {columns})
+            SELECT version, {error_id}, '{event}', {previous} FROM sync_state WHERE id = 1;
+            DELETE FROM error_events WHERE version <= (SELECT version FROM sync_state WHERE id = 1) - {FEED_EVENT_LOG_SIZE};
+    """
+
+def init_change_tracking(cursor: sqlite3.Cursor):
+    """Create the table version counter and per-error change records (with tombstones) used for ETags and delta sync."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'error_changes'")
+    exists = cursor.fetchone() is not None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO sync_state (id, version) VALUES (1, 0)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS error_changes (
+            error_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            changed_at TEXT NOT NULL,
+            event TEXT
+        )
+    """)
+    add_missing_columns(cursor, "error_changes", {"event": "TEXT", **{f"previous_{field}": "TEXT" for field in PREVIOUS_FIELDS}})
+    previous_columns = "".join(f", previous_{field} TEXT" for field in PREVIOUS_FIELDS)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS error_events (
+            version INTEGER PRIMARY KEY,
+            error_id TEXT NOT NULL,
+            event TEXT NOT NULL{previous_columns}
+        )
+    """)
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'errors_changes_update'")
+    trigger = cursor.fetchone()
+    if trigger and "error_events" not in trigger[0]:
+        # Triggers from before the event log are recreated below
+        for name in CHANGE_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_changes_version ON error_changes (version)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_changes_changed ON error_changes (changed_at)")
+    if not exists:
+        # Existing errors all start at version 1
+        cursor.execute("UPDATE sync_state SET version = 1 WHERE id = 1")
+        cursor.execute("INSERT INTO error_changes (error_id, version, deleted, changed_at) SELECT id, 1, 0, updated_at FROM errors")
+    # Deletes have no updated_at to reuse, so stamp them in the same format as datetime.isoformat()
+    now = "strftime('%Y-%m-%dT%H:%M:%f000', 'now', 'localtime')"
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS errors_changes_insert AFTER INSERT ON errors BEGIN
+            {change_trigger_body("new.id", "created", "new.updated_at", ["NULL"] * len(PREVIOUS_FIELDS))}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS errors_changes_update AFTER UPDATE ON errors BEGIN
+            {change_trigger_body("new.id", "updated", "new.updated_at", [f"old.{field}" for field in PREVIOUS_FIELDS])}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS errors_changes_delete AFTER DELETE ON errors BEGIN
+            {change_trigger_body("old.id", "deleted", now, [f"old.{field}" for field in PREVIOUS_FIELDS])}
+        END
+    """)
+    # Attachments are part of an error's representation, so file changes bump its version too
+    for operation, row, event in (("INSERT", "new", "file_attached"), ("UPDATE", "new", "updated"), ("DELETE", "old", "updated")):
+        # A file change leaves the error's own fields as they were
+        previous = [f"(SELECT {field} FROM errors WHERE id = {row}.error_id)" for field in PREVIOUS_FIELDS]
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS files_changes_{operation.lower()} AFTER {operation} ON files
+            WHEN EXISTS (SELECT 1 FROM errors WHERE id = {row}.error_id) BEGIN
+                {change_trigger_body(f"{row}.error_id", event, now, previous)}
+            END
+        """)
+
+def init_similarity_index(cursor: sqlite3.Cursor):
+    """Create the MinHash signature and LSH bucket tables used for duplicate detection."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS error_fingerprints (
+            error_id TEXT PRIMARY KEY,
+            signature BLOB NOT NULL,
+            FOREIGN KEY (error_id) REFERENCES errors(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS error_lsh (
+            bucket INTEGER NOT NULL,
+            error_id TEXT NOT NULL,
+            PRIMARY KEY (bucket, error_id),
+            FOREIGN KEY (error_id) REFERENCES errors(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_lsh_error ON error_lsh (error_id)")
+
+def init_export_jobs(cursor: sqlite3.Cursor):
+    """Create the table tracking background Word exports, so any worker can report on them."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS export_jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            processed INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            filename TEXT NOT NULL,
+            filters TEXT NOT NULL,
+            path TEXT NOT NULL,
+            error TEXT,
+            finished_at REAL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_export_jobs_finished ON export_jobs (finished_at)")
+
 # Pydantic models
 class ErrorBase(BaseModel):
     title: str
@@ -109,415 +912,2886 @@ class ErrorResponse(ErrorBase):
     class Config:
         from_attributes = True
 
+class SimilarError(BaseModel):
+    id: str
+    title: str
+    severity: str
+    status: str
+    created_at: str
+    score: float
+
+class ErrorCreated(ErrorResponse):
+    duplicates: List[SimilarError] = []
+
+class ErrorPage(BaseModel):
+    items: List[ErrorResponse]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+class SearchHit(ErrorResponse):
+    score: float
+    title_highlight: str
+    snippet: str
+
+class ErrorChanges(BaseModel):
+    items: List[ErrorResponse]
+    deleted: List[str]
+    since: str
+    has_more: bool = False
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+# Listing configuration
+ERROR_COLUMNS = "id, title, description, severity, category, tags, solution, status, created_at, updated_at"
+SORT_FIELDS = {"created_at", "updated_at"}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def row_to_error(row) -> dict:
+    return {
+        "id": row[0],
+        "title": row[1],
+        "description": row[2],
+        "severity": row[3],
+        "category": row[4],
+        "tags": json.loads(row[5]) if row[5] else [],
+        "solution": row[6],
+        "status": row[7],
+        "created_at": row[8],
+        "updated_at": row[9],
+    }
+
+def normalize_tags(tags: Iterable) -> List[str]:
+    """Strip whitespace and drop empty or repeated tags, keeping their order."""
+    normalized = []
+    for tag in tags:
+        tag = str(tag).strip()
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(list(values)).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Decode a cursor produced by encode_cursor, coercing each value with the given types (str by default)."""
+    types = types or (str, str)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if len(values) != len(types):
+            raise ValueError("cursor length mismatch")
+        return tuple(cast(value) for cast, value in zip(types, values))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def error_filter_conditions(filters: dict, alias: str = "errors") -> tuple:
+    """Translate list/export filters into SQL conditions and parameters against the errors table."""
+    conditions = []
+    params: list = []
+    for column in ("severity", "status", "category"):
+        if filters.get(column):
+            conditions.append(f"{alias}.{column} = ?")
+            params.append(filters[column])
+    if filters.get("tag"):
+        conditions.append(
+            f"{alias}.id IN (SELECT error_tags.error_id FROM error_tags JOIN tags ON tags.id = error_tags.tag_id WHERE tags.name = ?)"
+        )
+        params.append(filters["tag"])
+    if filters.get("created_from"):
+        conditions.append(f"{alias}.created_at >= ?")
+        params.append(filters["created_from"])
+    if filters.get("created_to"):
+        conditions.append(f"{alias}.created_at < ?")
+        params.append(filters["created_to"])
+    if filters.get("updated_since"):
+        conditions.append(f"{alias}.updated_at >= ?")
+        params.append(filters["updated_since"])
+    return conditions, params
+
+# Full-text search configuration: bm25 weights for title, description, solution, tags
+SEARCH_WEIGHTS = (10.0, 4.0, 2.0, 3.0)
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def build_fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query: every term must match, the last one as a prefix."""
+    tokens = SEARCH_TOKEN_PATTERN.findall(text)
+    if not tokens:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word")
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+# Duplicate detection: MinHash signatures over normalized text and stack-frame shingles,
+# indexed with LSH bands so candidate lookup is a handful of indexed bucket probes
+MINHASH_SALTS = [f"minhash{i}".encode("ascii") for i in range(4)]  # 16 values per blake2b digest
+MINHASH_PERMUTATIONS = 16 * len(MINHASH_SALTS)
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+LSH_MAX_CANDIDATES = 200
+# Rows read from any one bucket; templated errors can fill a bucket, and a lookup should not grow with it
+LSH_BUCKET_SCAN_LIMIT = 200
+DUPLICATE_MIN_SCORE = 0.5
+DUPLICATE_LIMIT = 5
+FINGERPRINT_BATCH_SIZE = 500
+
+# Volatile fragments that differ between reports of the same problem
+VOLATILE_PATTERNS = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), " <uuid> "),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b"), " <hex> "),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?z?\b"), " <time> "),
+    (re.compile(r"(?:[a-z]:)?(?:[\\/][\w.\-@]+)+[\\/]"), " "),  # directories, keeping the file name
+    (re.compile(r"\d+"), " <num> "),
+]
+TOKEN_PATTERN = re.compile(r"<\w+>|[a-z_][a-z0-9_]*")
+STACK_FRAME_PATTERN = re.compile(r'^\s*(?:at\s+\S|File\s+"|#\d+\s|\S+\(.*:\d+(?::\d+)?\)\s*$)', re.IGNORECASE)
+
+def normalize_tokens(text: str) -> List[str]:
+    text = (text or "").lower()
+    for pattern, replacement in VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return TOKEN_PATTERN.findall(text)
+
+def ngrams(tokens: List[str], size: int) -> List[str]:
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+def error_shingles(title: str, description: str) -> set:
+    """Word shingles of the normalized title and prose plus shingles of consecutive stack frames."""
+    frames, prose = [], []
+    for line in (description or "").splitlines():
+        if STACK_FRAME_PATTERN.match(line):
+            frames.append(" ".join(normalize_tokens(line)))
+        else:
+            prose.append(line)
+    shingles = {"t:" + shingle for shingle in ngrams(normalize_tokens(title), 2)}
+    shingles.update("d:" + shingle for shingle in ngrams(normalize_tokens("\n".join(prose)), 3))
+    shingles.update("f:" + "|".join(frames[i:i + 3]) for i in range(max(len(frames) - 2, 1)) if frames)
+    return shingles or {"t:"}
+
+def minhash_signature(shingles: set) -> array:
+    rows = []
+    for shingle in shingles:
+        data = shingle.encode("utf-8")
+        values = []
+        for salt in MINHASH_SALTS:
+            values.extend(struct.unpack("<16I", hashlib.blake2b(data, digest_size=64, salt=salt).digest()))
+        rows.append(values)
+    return array("I", map(min, zip(*rows)))
+
+def error_signature(title: str, description: str) -> array:
+    return minhash_signature(error_shingles(title, description))
+
+def lsh_buckets(signature: array) -> List[int]:
+    buckets = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+def signature_similarity(a: array, b: array) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / MINHASH_PERMUTATIONS
+
+def store_fingerprint(conn: sqlite3.Connection, error_id: str, signature: array, replace: bool = True) -> bool:
+    """Write an error's signature and LSH buckets; with replace=False an existing fingerprint wins."""
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    cursor = conn.execute(
+        f"{verb} INTO error_fingerprints (error_id, signature) VALUES (?, ?)", (error_id, signature.tobytes())
+    )
+    if not cursor.rowcount:
+        return False
+    conn.execute("DELETE FROM error_lsh WHERE error_id = ?", (error_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO error_lsh (bucket, error_id) VALUES (?, ?)",
+        [(bucket, error_id) for bucket in lsh_buckets(signature)]
+    )
+    return True
+
+def find_similar(conn: sqlite3.Connection, signature: array, exclude_id: Optional[str],
+                 limit: int = DUPLICATE_LIMIT, min_score: float = DUPLICATE_MIN_SCORE) -> List[dict]:
+    """Score errors sharing at least one LSH band with the signature and return the closest matches."""
+    buckets = lsh_buckets(signature)
+    probes = " UNION ALL ".join(
+        "SELECT * FROM (SELECT error_id FROM error_lsh WHERE bucket = ? LIMIT ?)" for _ in buckets
+    )
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT error_id FROM ({probes}) GROUP BY error_id ORDER BY COUNT(*) DESC LIMIT ?",
+        (*(value for bucket in buckets for value in (bucket, LSH_BUCKET_SCAN_LIMIT)), LSH_MAX_CANDIDATES + 1)
+    )
+    candidates = [row[0] for row in cursor.fetchall() if row[0] != exclude_id]
+    if not candidates:
+        return []
+    placeholders = ", ".join("?" for _ in candidates)
+    cursor.execute(f"SELECT error_id, signature FROM error_fingerprints WHERE error_id IN ({placeholders})", candidates)
+    scored = []
+    for error_id, blob in cursor.fetchall():
+        score = signature_similarity(signature, array("I", blob))
+        if score >= min_score:
+            scored.append((score, error_id))
+    scored.sort(reverse=True)
+    scored = scored[:limit]
+    if not scored:
+        return []
+    placeholders = ", ".join("?" for _ in scored)
+    cursor.execute(
+        f"SELECT id, title, severity, status, created_at FROM errors WHERE id IN ({placeholders})",
+        [error_id for _, error_id in scored]
+    )
+    details = {row[0]: row for row in cursor.fetchall()}
+    return [
+        {"id": error_id, "title": details[error_id][1], "severity": details[error_id][2],
+         "status": details[error_id][3], "created_at": details[error_id][4], "score": round(score, 3)}
+        for score, error_id in scored if error_id in details
+    ]
+
+def index_missing_fingerprints() -> int:
+    """Fingerprint errors that have none yet (existing databases, bulk imports), in keyset batches."""
+    indexed = 0
+    last_id = ""
+    while True:
+        with db_connection() as conn:
+            rows = conn.execute(
+                """SELECT id, title, description FROM errors e WHERE id > ?
+                   AND NOT EXISTS (SELECT 1 FROM error_fingerprints f WHERE f.error_id = e.id)
+                   ORDER BY id LIMIT ?""",
+                (last_id, FINGERPRINT_BATCH_SIZE)
+            ).fetchall()
+        if not rows:
+            break
+        signatures = [(row[0], error_signature(row[1], row[2])) for row in rows]
+        with db_connection() as conn:
+            begin_write(conn)
+            for error_id, signature in signatures:
+                # A concurrent create or update may have stored a fresher fingerprint meanwhile
+                if conn.execute("SELECT 1 FROM errors WHERE id = ?", (error_id,)).fetchone():
+                    indexed += store_fingerprint(conn, error_id, signature, replace=False)
+            conn.commit()
+        last_id = rows[-1][0]
+    if indexed:
+        logger.info(f"Fingerprinted {indexed} errors for duplicate detection")
+    return indexed
+
+fingerprint_backfill_lock = threading.Lock()
+fingerprint_backfill_pending = threading.Event()
+
+def schedule_fingerprint_backfill():
+    """Run index_missing_fingerprints on a background thread, coalescing requests made while it runs."""
+    fingerprint_backfill_pending.set()
+    if not fingerprint_backfill_lock.acquire(blocking=False):
+        return
+
+    def worker():
+        try:
+            while fingerprint_backfill_pending.is_set():
+                fingerprint_backfill_pending.clear()
+                index_missing_fingerprints()
+        except Exception as e:
+            logger.error(f"Fingerprint backfill failed: {str(e)}")
+        finally:
+            fingerprint_backfill_lock.release()
+
+    threading.Thread(target=worker, name="fingerprint-backfill", daemon=True).start()
+
 # Database operations
+FILE_COLUMNS = "id, filename, filepath, size, mimetype, encoding"
+# Stay well below SQLite's bound-parameter limit for IN (...) lookups
+MAX_IN_PARAMS = 900
+
+def read_inline_content(filepath: str, size: int, encoding: Optional[str] = None) -> Optional[str]:
+    """Base64-encode a small attachment for inline delivery, or None if it is too large or missing."""
+    try:
+        if size > INLINE_CONTENT_MAX_BYTES:
+            return None
+        with open_blob(filepath, encoding) as f:
+            data = f.read()
+        record_upload_io("read", len(data))
+        with timed_phase("base64"):
+            return base64.b64encode(data).decode('utf-8')
+    except OSError:
+        return None
+
+def row_to_file(row, include_content: bool = False) -> dict:
+    file_info = {
+        "id": row[0],
+        "filename": row[1],
+        "filepath": row[2],
+        "size": row[3],
+        "mimetype": row[4],
+        "encoding": row[5],
+    }
+    if include_content:
+        file_info["content"] = read_inline_content(row[2], row[3], row[5])
+    return file_info
+
+# Attachments are stored once per distinct content under UPLOAD_DIR/<sha256>, or as
+# UPLOAD_DIR/<sha256>.gz when they are text that compresses well. Attachments of
+# long-resolved errors can be moved to UPLOAD_DIR/archive/ (see run_storage_maintenance).
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+ARCHIVE_DIR_NAME = "archive"
+BLOB_SUFFIXES = {None: "", "gzip": ".gz"}
+COMPRESSIBLE_MIMETYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/xml", "application/javascript",
+    "application/x-yaml", "application/yaml", "application/csv", "application/sql", "application/x-sh",
+)
+COMPRESSIBLE_EXTENSIONS = (".log", ".txt", ".out", ".err", ".trace", ".dump", ".json", ".ndjson", ".xml", ".csv", ".yaml", ".yml")
+COMPRESS_MIN_BYTES = 1024
+# Keep the original unless compression saves at least 10%
+COMPRESS_MAX_RATIO = 0.9
+COMPRESS_LEVEL = 6
+# Upload quotas, per file and per error (sum of all attachments)
+MAX_FILE_BYTES = int(os.environ.get("MAX_FILE_BYTES", 1024 * 1024 * 1024))
+MAX_ERROR_ATTACHMENT_BYTES = int(os.environ.get("MAX_ERROR_ATTACHMENT_BYTES", 2 * 1024 * 1024 * 1024))
+
+def incoming_dir() -> str:
+    path = os.path.join(UPLOAD_DIR, ".incoming")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def archive_dir() -> str:
+    path = os.path.join(UPLOAD_DIR, ARCHIVE_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def blob_path(digest: str, encoding: Optional[str] = None, archived: bool = False) -> str:
+    directory = os.path.join(UPLOAD_DIR, ARCHIVE_DIR_NAME) if archived else UPLOAD_DIR
+    return os.path.join(directory, digest + BLOB_SUFFIXES[encoding])
+
+def find_blob(digest: str) -> Optional[tuple]:
+    """Return (path, encoding) of the stored copy of this content in any tier, or None."""
+    for archived in (False, True):
+        for encoding in BLOB_SUFFIXES:
+            path = blob_path(digest, encoding, archived)
+            if os.path.exists(path):
+                return path, encoding
+    return None
+
+def open_blob(path: str, encoding: Optional[str] = None):
+    """Open a stored attachment for reading its original bytes, decompressing as it is read."""
+    if encoding == "gzip":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+def is_compressible(mimetype: Optional[str], filename: str = "") -> bool:
+    mimetype = (mimetype or "").split(";")[0].strip().lower()
+    return mimetype.startswith(COMPRESSIBLE_MIMETYPES) or filename.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+def gzip_to_temp(source_path: str, size: int, level: int) -> Optional[str]:
+    """Write a gzip copy of source_path into the incoming directory.
+
+    Returns the temp path, or None when compression would not save enough space to be worth it.
+    """
+    temp_path = os.path.join(incoming_dir(), f"{uuid.uuid4().hex}.partial")
+    try:
+        with timed_phase("compress"), open(source_path, "rb") as source, gzip.open(temp_path, "wb", compresslevel=level) as target:
+            shutil.copyfileobj(source, target, UPLOAD_CHUNK_SIZE)
+        compressed_size = os.path.getsize(temp_path)
+    except Exception:
+        remove_file_quietly(temp_path)
+        raise
+    record_upload_io("read", size)
+    if compressed_size > size * COMPRESS_MAX_RATIO:
+        remove_file_quietly(temp_path)
+        return None
+    record_upload_io("written", compressed_size)
+    return temp_path
+
+def encode_for_storage(path: str, mimetype: Optional[str], filename: str, size: int) -> tuple:
+    """Compress a hashed upload before it is stored, if its type and size make that worthwhile.
+
+    Returns (encoded temp path, encoding), or (None, None) to store the file as-is.
+    The source file is left in place for the caller to clean up.
+    """
+    if size < COMPRESS_MIN_BYTES or not is_compressible(mimetype, filename):
+        return None, None
+    encoded_path = gzip_to_temp(path, size, COMPRESS_LEVEL)
+    return (encoded_path, "gzip") if encoded_path else (None, None)
+
+def stream_to_temp(source) -> tuple:
+    """Copy a file object into a temporary file in UPLOAD_DIR, hashing it on the way.
+
+    Returns (temp path, sha256 hex digest, size in bytes).
+    """
+    temp_path = os.path.join(incoming_dir(), f"{uuid.uuid4().hex}.partial")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as buffer:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_FILE_BYTES:
+                    raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_FILE_BYTES} byte limit")
+                hasher.update(chunk)
+                buffer.write(chunk)
+    except Exception:
+        remove_file_quietly(temp_path)
+        raise
+    record_upload_io("written", size)
+    return temp_path, hasher.hexdigest(), size
+
+def store_blob(temp_path: str, digest: str, encoding: Optional[str] = None) -> tuple:
+    """Move a hashed temp file into place as a blob, or drop it if that content is already stored.
+
+    Returns the (path, encoding) the content is stored under, which for existing content
+    may be another tier or encoding. Must run inside a write transaction so a concurrent
+    delete cannot remove the blob in between.
+    """
+    existing = find_blob(digest)
+    if existing:
+        remove_file_quietly(temp_path)
+        logger.debug(f"Reusing stored blob: {existing[0]}")
+        return existing
+    path = blob_path(digest, encoding)
+    os.replace(temp_path, path)
+    logger.debug(f"Stored new blob: {path}")
+    return path, encoding
+
+def release_blobs(paths: Iterable[str]):
+    """Remove blobs, and their renditions, that no files row references any more.
+
+    Called after the transaction that deleted the references has committed, so a rollback
+    never loses content; a crash in between leaves the blobs to the orphan sweeper.
+    """
+    for path in set(paths):
+        with db_connection() as conn:
+            # Re-checked under the write lock, so content being re-attached right now is kept
+            begin_write(conn)
+            if conn.execute("SELECT 1 FROM files WHERE filepath = ?", (path,)).fetchone():
+                logger.debug(f"Blob still referenced, keeping: {path}")
+                continue
+            try:
+                os.remove(path)
+                logger.debug(f"Deleted file: {path}")
+            except OSError as e:
+                logger.warning(f"Failed to delete file {path}: {str(e)}")
+            for rendition in rendition_paths(path):
+                if os.path.exists(rendition):
+                    remove_file_quietly(rendition)
+
+def begin_write(conn: sqlite3.Connection):
+    # Take SQLite's write lock up front so blob checks and row changes are serialized
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+def check_error_quota(conn: sqlite3.Connection, error_id: str, size: int):
+    used = conn.execute("SELECT COALESCE(SUM(size), 0) FROM files WHERE error_id = ?", (error_id,)).fetchone()[0]
+    if used + size > MAX_ERROR_ATTACHMENT_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Attachments for this error would exceed the {MAX_ERROR_ATTACHMENT_BYTES} byte limit",
+        )
+
+def attach_blob(
+    conn: sqlite3.Connection, error_id: str, filename: str, mimetype: str, temp_path: str, digest: str, size: int,
+    encoding: Optional[str] = None,
+) -> dict:
+    """Store a hashed temp file as a blob and record it as an attachment of error_id.
+
+    ``size`` is the original size even when ``temp_path`` holds compressed content.
+    Runs inside the caller's write transaction.
+    """
+    check_error_quota(conn, error_id, size)
+    file_id = str(uuid.uuid4())
+    path, encoding = store_blob(temp_path, digest, encoding)
+    conn.execute(
+        "INSERT INTO files (id, error_id, filename, filepath, size, mimetype, sha256, encoding) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (file_id, error_id, filename, path, size, mimetype, digest, encoding)
+    )
+    logger.debug(f"File metadata saved for file_id: {file_id}")
+    return {
+        "id": file_id,
+        "error_id": error_id,
+        "filename": filename,
+        "filepath": path,
+        "size": size,
+        "mimetype": mimetype,
+        "encoding": encoding,
+    }
+
 def save_file(file: UploadFile, error_id: str) -> dict:
     if not file.filename:
         logger.warning("No file provided for upload")
         raise HTTPException(status_code=400, detail="No file provided")
-    file_id = str(uuid.uuid4())
-    file_extension = os.path.splitext(file.filename)[1]
-    file_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_extension}")
-    
+
+    mimetype = file.content_type or "application/octet-stream"
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        logger.debug(f"File saved: {file_path}")
+        temp_path, digest, size = stream_to_temp(file.file)
+        logger.debug(f"File received: {file.filename} ({size} bytes, sha256 {digest})")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to save file {file.filename}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
-    
-    file_info = {
-        "id": file_id,
-        "error_id": error_id,
-        "filename": file.filename,
-        "filepath": file_path,
-        "size": file.size or 0,
-        "mimetype": file.content_type or "application/octet-stream"
-    }
-    
+
+    encoded_path = None
     try:
-        with sqlite3.connect(DB_FILE) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO files (id, error_id, filename, filepath, size, mimetype) VALUES (?, ?, ?, ?, ?, ?)",
-                (file_id, error_id, file.filename, file_path, file_info["size"], file_info["mimetype"])
-            )
+        # Compress before taking the write lock so other writers are not held up
+        encoded_path, encoding = encode_for_storage(temp_path, mimetype, file.filename, size)
+        with db_connection() as conn:
+            begin_write(conn)
+            file_info = attach_blob(conn, error_id, file.filename, mimetype, encoded_path or temp_path, digest, size, encoding)
             conn.commit()
-            logger.debug(f"File metadata saved for file_id: {file_id}")
+            return file_info
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to save file metadata: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to save file metadata: {str(e)}")
-    
-    return file_info
+    finally:
+        for path in (temp_path, encoded_path):
+            if path and os.path.exists(path):
+                remove_file_quietly(path)
+
+def hash_file(path: str) -> tuple:
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            size += len(chunk)
+    record_upload_io("read", size)
+    return hasher.hexdigest(), size
+
+def deduplicate_uploads() -> dict:
+    """Move attachments stored before content addressing into blobs, merging duplicates.
+
+    Only rows without a sha256 are touched, so this is safe to run on every start.
+    Returns counts and the number of bytes freed on disk.
+    """
+    report = {"files_scanned": 0, "files_missing": 0, "duplicates_removed": 0, "bytes_freed": 0}
+    with db_connection() as conn:
+        rows = conn.execute("SELECT id, filepath FROM files WHERE sha256 IS NULL").fetchall()
+    for file_id, path in rows:
+        report["files_scanned"] += 1
+        if not os.path.exists(path):
+            report["files_missing"] += 1
+            logger.warning(f"Skipping missing attachment during deduplication: {path}")
+            continue
+        digest, size = hash_file(path)
+        target = blob_path(digest)
+        with db_connection() as conn:
+            begin_write(conn)
+            if path != target:
+                shared = conn.execute("SELECT COUNT(*) FROM files WHERE filepath = ? AND id != ?", (path, file_id)).fetchone()[0]
+                if os.path.exists(target):
+                    if not shared:
+                        os.remove(path)
+                        report["duplicates_removed"] += 1
+                        report["bytes_freed"] += size
+                elif shared:
+                    shutil.copyfile(path, target)
+                else:
+                    os.replace(path, target)
+                if not shared:
+                    for rendition in rendition_paths(path):
+                        if os.path.exists(rendition):
+                            remove_file_quietly(rendition)
+            conn.execute("UPDATE files SET filepath = ?, sha256 = ?, size = ? WHERE id = ?", (target, digest, size, file_id))
+            conn.commit()
+    if report["files_scanned"]:
+        logger.info(
+            f"Deduplicated uploads: scanned {report['files_scanned']} files, removed {report['duplicates_removed']} duplicates, "
+            f"freed {report['bytes_freed']} bytes"
+        )
+    return report
 
-def get_files_for_error(error_id: str) -> List[dict]:
+def get_files_for_error(error_id: str, include_content: bool = False) -> List[dict]:
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, filename, filepath, size, mimetype FROM files WHERE error_id = ?", (error_id,))
-            files = [
-                {
-                    "id": row[0],
-                    "filename": row[1],
-                    "filepath": row[2],
-                    "size": row[3],
-                    "mimetype": row[4],
-                    "content": base64.b64encode(open(row[2], "rb").read()).decode('utf-8') if os.path.exists(row[2]) else None
-                }
-                for row in cursor.fetchall()
-            ]
+            cursor.execute(f"SELECT {FILE_COLUMNS} FROM files WHERE error_id = ?", (error_id,))
+            # Bodies are fetched lazily through /api/files/{id}; only small files may be inlined on request
+            files = [row_to_file(row, include_content) for row in cursor.fetchall()]
             logger.debug(f"Retrieved {len(files)} files for error_id: {error_id}")
             return files
     except Exception as e:
         logger.error(f"Failed to retrieve files for error_id {error_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve files: {str(e)}")
 
-# API endpoints
-@app.post("/api/errors", response_model=ErrorResponse)
-async def create_error(
-    title: str = Form(...),
-    description: str = Form(...),
-    severity: str = Form(...),
-    category: Optional[str] = Form(None),
-    tags: str = Form("[]"),
-    solution: Optional[str] = Form(None),
-    status: str = Form(...),
-    files: List[UploadFile] = File([])
-):
-    error_id = str(uuid.uuid4())
-    created_at = datetime.now().isoformat()
-    tags_list = json.loads(tags)
-    
-    # Validate severity and status
-    if severity not in ['critical', 'high', 'medium', 'low']:
-        raise HTTPException(status_code=400, detail="Invalid severity value")
-    if status not in ['open', 'in-progress', 'resolved']:
-        raise HTTPException(status_code=400, detail="Invalid status value")
-    
+def get_files_for_errors(conn: sqlite3.Connection, error_ids: Iterable[str], include_content: bool = False) -> Dict[str, List[dict]]:
+    """Load file metadata for many errors with one IN (...) query per batch, grouped by error id."""
+    error_ids = list(error_ids)
+    files: Dict[str, List[dict]] = {error_id: [] for error_id in error_ids}
+    cursor = conn.cursor()
+    for i in range(0, len(error_ids), MAX_IN_PARAMS):
+        batch = error_ids[i:i + MAX_IN_PARAMS]
+        placeholders = ", ".join("?" for _ in batch)
+        cursor.execute(f"SELECT error_id, {FILE_COLUMNS} FROM files WHERE error_id IN ({placeholders})", batch)
+        for row in cursor.fetchall():
+            files[row[0]].append(row_to_file(row[1:], include_content))
+    logger.debug(f"Retrieved files for {len(error_ids)} errors")
+    return files
+
+def insert_error(error: dict, files: List[UploadFile]) -> dict:
+    signature = error_signature(error["title"], error["description"])
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO errors (id, title, description, severity, category, tags, solution, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (error_id, title, description, severity, category, json.dumps(tags_list), solution, status, created_at, created_at)
+                "INSERT INTO errors (id, title, description, severity, category, tags, solution, status, created_at, updated_at, resolved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (error["id"], error["title"], error["description"], error["severity"], error["category"], json.dumps(error["tags"]), error["solution"], error["status"], error["created_at"], error["updated_at"],
+                 error["created_at"] if error["status"] == "resolved" else None)
             )
+            store_fingerprint(conn, error["id"], signature)
             conn.commit()
-            logger.info(f"Error created with id: {error_id}")
+            logger.info(f"Error created with id: {error['id']}")
+            error["duplicates"] = find_similar(conn, signature, error["id"])
+            if error["duplicates"]:
+                logger.info(f"Error {error['id']} has {len(error['duplicates'])} likely duplicates")
     except Exception as e:
         logger.error(f"Failed to create error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create error: {str(e)}")
-    
-    file_infos = [save_file(file, error_id) for file in files if file.filename]
-    
-    return {
-        "id": error_id,
-        "title": title,
-        "description": description,
-        "severity": severity,
-        "category": category,
-        "tags": tags_list,
-        "solution": solution,
-        "status": status,
-        "created_at": created_at,
-        "updated_at": created_at,
-        "files": file_infos
-    }
 
-@app.get("/api/errors", response_model=List[ErrorResponse])
-async def get_errors():
+    error["files"] = [save_file(file, error["id"]) for file in files if file.filename]
+    return error
+
+def query_errors_page(query: str, params: list, limit: int, sort: str, include_content: bool) -> dict:
     try:
-        with sqlite3.connect(DB_FILE) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM errors")
+        with db_connection() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            files_by_error = get_files_for_errors(conn, [row[0] for row in rows], include_content)
             errors = []
-            for row in cursor.fetchall():
-                error = {
-                    "id": row[0],
-                    "title": row[1],
-                    "description": row[2],
-                    "severity": row[3],
-                    "category": row[4],
-                    "tags": json.loads(row[5]) if row[5] else [],
-                    "solution": row[6],
-                    "status": row[7],
-                    "created_at": row[8],
-                    "updated_at": row[9],
-                    "files": get_files_for_error(row[0])
-                }
+            for row in rows:
+                error = row_to_error(row)
+                error["files"] = files_by_error[row[0]]
                 errors.append(error)
-            logger.info(f"Retrieved {len(errors)} errors")
-            return errors
+
+            next_cursor = None
+            if has_more and errors:
+                last = errors[-1]
+                next_cursor = encode_cursor(last[sort], last["id"])
+            logger.info(f"Retrieved {len(errors)} errors (has_more={has_more})")
+            return {"items": errors, "next_cursor": next_cursor, "has_more": has_more}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to retrieve errors: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve errors: {str(e)}")
 
-@app.get("/api/errors/{error_id}", response_model=ErrorResponse)
-async def get_error(error_id: str):
-    logger.debug(f"Fetching error with id: {error_id}")
+def search_errors_page(fts_query: str, filters: dict, after: Optional[tuple], limit: int) -> dict:
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    conditions = []
+    params: list = [fts_query]
+    for column, value in filters.items():
+        if value:
+            conditions.append(f"e.{column} = ?")
+            params.append(value)
+    if after:
+        # Keyset over (score, rowid): bm25 scores are negative, best match first
+        conditions.append("(hits.score, hits.rowid) > (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit + 1)
+    query = f"""
+        SELECT {', '.join('e.' + column.strip() for column in ERROR_COLUMNS.split(','))},
+               hits.score, hits.rowid, hits.title_highlight, hits.snippet
+        FROM (
+            SELECT rowid,
+                   bm25(errors_fts, {weights}) AS score,
+                   highlight(errors_fts, 0, '<mark>', '</mark>') AS title_highlight,
+                   snippet(errors_fts, -1, '<mark>', '</mark>', '…', 24) AS snippet
+            FROM errors_fts
+            WHERE errors_fts MATCH ?
+        ) AS hits
+        JOIN errors e ON e.rowid = hits.rowid
+        {where}
+        ORDER BY hits.score, hits.rowid
+        LIMIT ?
+    """
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM errors WHERE id = ?", (error_id,))
-            row = cursor.fetchone()
-            if not row:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            files_by_error = get_files_for_errors(conn, [row[0] for row in rows])
+            hits = []
+            for row in rows:
+                hit = row_to_error(row[:10])
+                hit["files"] = files_by_error[row[0]]
+                hit["score"] = row[10]
+                hit["title_highlight"] = row[12]
+                hit["snippet"] = row[13]
+                hits.append(hit)
+            next_cursor = encode_cursor(rows[-1][10], rows[-1][11]) if has_more and rows else None
+            logger.info(f"Search matched {len(hits)} errors (has_more={has_more})")
+            return {"items": hits, "next_cursor": next_cursor, "has_more": has_more}
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Invalid search query {fts_query!r}: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {str(e)}")
+    except Exception as e:
+        logger.error(f"Failed to search errors: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to search errors: {str(e)}")
+
+def fetch_error(error_id: str, include_content: bool = False) -> dict:
+    logger.debug(f"Fetching error with id: {error_id}")
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {ERROR_COLUMNS} FROM errors WHERE id = ?", (error_id,))
+            row = cursor.fetchone()
+            if not row:
                 logger.warning(f"Error not found for id: {error_id}")
                 raise HTTPException(status_code=404, detail="Error not found")
-        
-            return {
-                "id": row[0],
-                "title": row[1],
-                "description": row[2],
-                "severity": row[3],
-                "category": row[4],
-                "tags": json.loads(row[5]) if row[5] else [],
-                "solution": row[6],
-                "status": row[7],
-                "created_at": row[8],
-                "updated_at": row[9],
-                "files": get_files_for_error(row[0])
-            }
+
+            error = row_to_error(row)
+            error["files"] = get_files_for_error(row[0], include_content)
+            return error
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to retrieve error {error_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve error: {str(e)}")
 
-@app.put("/api/errors/{error_id}", response_model=ErrorResponse)
-async def update_error(
-    error_id: str,
-    title: str = Form(...),
-    description: str = Form(...),
-    severity: str = Form(...),
-    category: Optional[str] = Form(None),
-    tags: str = Form("[]"),
-    solution: Optional[str] = Form(None),
-    status: str = Form(...),
-    files: List[UploadFile] = File([])
-):
+def update_error_record(error: dict, files: List[UploadFile]) -> dict:
+    error_id = error["id"]
     logger.debug(f"Attempting to update error with id: {error_id}")
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id, created_at FROM errors WHERE id = ?", (error_id,))
             row = cursor.fetchone()
             if not row:
                 logger.warning(f"Error not found for update: {error_id}")
                 raise HTTPException(status_code=404, detail="Error not found")
-            
-            created_at = row[1]
-            updated_at = datetime.now().isoformat()
-            tags_list = json.loads(tags)
-            
-            # Validate severity and status
-            if severity not in ['critical', 'high', 'medium', 'low']:
-                raise HTTPException(status_code=400, detail="Invalid severity value")
-            if status not in ['open', 'in-progress', 'resolved']:
-                raise HTTPException(status_code=400, detail="Invalid status value")
-            
+
+            error["created_at"] = row[1]
+            error["updated_at"] = datetime.now().isoformat()
+            # resolved_at keeps the original resolution time across later edits and clears on reopen
             cursor.execute(
-                "UPDATE errors SET title = ?, description = ?, severity = ?, category = ?, tags = ?, solution = ?, status = ?, updated_at = ? WHERE id = ?",
-                (title, description, severity, category, json.dumps(tags_list), solution, status, updated_at, error_id)
+                """UPDATE errors SET title = ?, description = ?, severity = ?, category = ?, tags = ?, solution = ?, status = ?, updated_at = ?,
+                   resolved_at = CASE WHEN ? != 'resolved' THEN NULL WHEN status = 'resolved' THEN resolved_at ELSE ? END
+                   WHERE id = ?""",
+                (error["title"], error["description"], error["severity"], error["category"], json.dumps(error["tags"]), error["solution"], error["status"], error["updated_at"],
+                 error["status"], error["updated_at"], error_id)
             )
+            store_fingerprint(conn, error_id, error_signature(error["title"], error["description"]))
             conn.commit()
             logger.debug(f"Error {error_id} updated in database")
-            
+
             # Append new files without deleting existing ones
-            file_infos = [save_file(file, error_id) for file in files if file.filename]
-            existing_files = get_files_for_error(error_id)
-            
+            for file in files:
+                if file.filename:
+                    save_file(file, error_id)
+            error["files"] = get_files_for_error(error_id)
+
             logger.info(f"Error {error_id} updated successfully")
-            return {
-                "id": error_id,
-                "title": title,
-                "description": description,
-                "severity": severity,
-                "category": category,
-                "tags": tags_list,
-                "solution": solution,
-                "status": status,
-                "created_at": created_at,
-                "updated_at": updated_at,
-                "files": existing_files
-            }
+            return error
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to update error {error_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to update error: {str(e)}")
 
-@app.delete("/api/errors/{error_id}")
-async def delete_error(error_id: str):
+def delete_error_record(error_id: str):
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id FROM errors WHERE id = ?", (error_id,))
             if not cursor.fetchone():
                 logger.warning(f"Error not found for deletion: {error_id}")
                 raise HTTPException(status_code=404, detail="Error not found")
-            
+
+            begin_write(conn)
             cursor.execute("SELECT filepath FROM files WHERE error_id = ?", (error_id,))
-            for row in cursor.fetchall():
-                try:
-                    os.remove(row[0])
-                    logger.debug(f"Deleted file: {row[0]}")
-                except OSError as e:
-                    logger.warning(f"Failed to delete file {row[0]}: {str(e)}")
-            
+            paths = [row[0] for row in cursor.fetchall()]
+
             cursor.execute("DELETE FROM files WHERE error_id = ?", (error_id,))
             cursor.execute("DELETE FROM errors WHERE id = ?", (error_id,))
             conn.commit()
-            logger.info(f"Error {error_id} deleted successfully")
-            
-            return {"message": "Error deleted successfully"}
+        # Blobs shared with other errors stay until their last reference is gone
+        release_blobs(paths)
+        logger.info(f"Error {error_id} deleted successfully")
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to delete error {error_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to delete error: {str(e)}")
 
-@app.get("/api/files/{file_id}")
-async def get_file(file_id: str):
+def fetch_file_record(file_id: str) -> tuple:
     try:
-        with sqlite3.connect(DB_FILE) as conn:
+        with db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT filepath, filename, mimetype FROM files WHERE id = ?", (file_id,))
+            cursor.execute("SELECT filepath, filename, mimetype, encoding, size FROM files WHERE id = ?", (file_id,))
             row = cursor.fetchone()
-            if not row:
-                logger.warning(f"File not found: {file_id}")
-                raise HTTPException(status_code=404, detail="File not found")
-            
-            filepath, filename, mimetype = row
-            with open(filepath, "rb") as file:
-                content = base64.b64encode(file.read()).decode('utf-8')
-                logger.debug(f"Retrieved file: {filename}")
-                return JSONResponse(
-                    content={
-                        "filename": filename,
-                        "content": content,
-                        "mimetype": mimetype
-                    }
-                )
-    except HTTPException:
-        raise
+    except Exception as e:
+        logger.error(f"Failed to look up file {file_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve file: {str(e)}")
+    if not row:
+        logger.warning(f"File not found: {file_id}")
+        raise HTTPException(status_code=404, detail="File not found")
+    return row
+
+def read_file_payload(file_id: str) -> dict:
+    filepath, filename, mimetype, encoding, _ = fetch_file_record(file_id)
+    try:
+        with open_blob(filepath, encoding) as file:
+            data = file.read()
+        record_upload_io("read", len(data))
+        with timed_phase("base64"):
+            content = base64.b64encode(data).decode('utf-8')
+        logger.debug(f"Retrieved file: {filename}")
+        return {
+            "filename": filename,
+            "content": content,
+            "mimetype": mimetype
+        }
     except Exception as e:
         logger.error(f"Failed to retrieve file {file_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve file: {str(e)}")
 
-@app.get("/api/export/word")
-async def export_to_word():
+def validate_error_fields(severity: str, status: str):
+    if severity not in ['critical', 'high', 'medium', 'low']:
+        raise HTTPException(status_code=400, detail="Invalid severity value")
+    if status not in ['open', 'in-progress', 'resolved']:
+        raise HTTPException(status_code=400, detail="Invalid status value")
+
+# API endpoints
+@app.post("/api/errors", response_model=ErrorCreated)
+async def create_error(
+    title: str = Form(...),
+    description: str = Form(...),
+    severity: str = Form(...),
+    category: Optional[str] = Form(None),
+    tags: str = Form("[]"),
+    solution: Optional[str] = Form(None),
+    status: str = Form(...),
+    files: List[UploadFile] = File([])
+):
+    created_at = datetime.now().isoformat()
+    tags_list = normalize_tags(json.loads(tags))
+    validate_error_fields(severity, status)
+
+    error = {
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "description": description,
+        "severity": severity,
+        "category": category,
+        "tags": tags_list,
+        "solution": solution,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    created = await run_blocking(insert_error, error, files)
+    change_feed.notify()
+    return created
+
+@app.get("/api/errors", response_model=ErrorPage)
+async def get_errors(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    include_content: bool = False,
+):
+    if sort not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail="Invalid sort field")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid sort order")
+
+    conditions, params = error_filter_conditions(
+        {"severity": severity, "status": status, "category": category, "tag": tag}
+    )
+    if q:
+        # Kept for API compatibility; matched through the full-text index rather than a LIKE scan
+        conditions.append("rowid IN (SELECT rowid FROM errors_fts WHERE errors_fts MATCH ?)")
+        params.append(build_fts_query(q))
+    if cursor:
+        # Keyset pagination: continue strictly after the last (sort value, id) seen
+        sort_value, last_id = decode_cursor(cursor)
+        comparison = "<" if order == "desc" else ">"
+        conditions.append(f"({sort}, id) {comparison} (?, ?)")
+        params.extend([sort_value, last_id])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    direction = order.upper()
+    query = f"SELECT {ERROR_COLUMNS} FROM errors {where} ORDER BY {sort} {direction}, id {direction} LIMIT ?"
+    params.append(limit + 1)
+
+    etag = collection_etag(request, await run_blocking(current_version))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_version_headers(response, etag)
+    return await run_blocking(query_errors_page, query, params, limit, sort, include_content)
+
+@app.get("/api/errors/search", response_model=SearchPage)
+async def search_errors(
+    request: Request,
+    response: Response,
+    q: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+):
+    fts_query = build_fts_query(q)
+    after = decode_cursor(cursor, float, int) if cursor else None
+    filters = {"severity": severity, "status": status, "category": category}
+    etag = collection_etag(request, await run_blocking(current_version))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_version_headers(response, etag)
+    return await run_blocking(search_errors_page, fts_query, filters, after, limit)
+
+# Conditional GET and delta sync
+CHANGES_DEFAULT_LIMIT = 200
+CHANGES_MAX_LIMIT = 1000
+
+def current_version() -> int:
+    with db_connection() as conn:
+        return conn.execute("SELECT version FROM sync_state WHERE id = 1").fetchone()[0]
+
+def error_version(error_id: str) -> Optional[int]:
+    with db_connection() as conn:
+        row = conn.execute(
+            "SELECT version FROM error_changes WHERE error_id = ? AND deleted = 0", (error_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+def collection_etag(request: Request, version: int) -> str:
+    # The same table version answers differently per filter, page and sort, so the query is part of the tag
+    query = hashlib.md5(str(request.url.query).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{query}"'
+
+def set_version_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # Clients may cache but must revalidate, which is a cheap version lookup
+    response.headers["Cache-Control"] = "no-cache"
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def parse_since(since: str) -> tuple:
+    """A ``since`` value is either a sync token returned by a previous call or an ISO timestamp."""
+    if since.isdigit():
+        return "version", int(since)
+    try:
+        datetime.fromisoformat(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since value; use a sync token or ISO timestamp")
+    return "changed_at", since
+
+def load_changed_errors(conn: sqlite3.Connection, error_ids: List[str], include_content: bool) -> Dict[str, dict]:
+    """Load the current state of the given errors, with their files, keyed by id."""
+    errors = {}
+    cursor = conn.cursor()
+    for i in range(0, len(error_ids), MAX_IN_PARAMS):
+        batch = error_ids[i:i + MAX_IN_PARAMS]
+        placeholders = ", ".join("?" for _ in batch)
+        cursor.execute(f"SELECT {ERROR_COLUMNS} FROM errors WHERE id IN ({placeholders})", batch)
+        errors.update((row[0], row_to_error(row)) for row in cursor.fetchall())
+    files = get_files_for_errors(conn, errors.keys(), include_content)
+    for error_id, error in errors.items():
+        error["files"] = files[error_id]
+    return errors
+
+def fetch_error_changes(since: Optional[str], limit: int, include_content: bool) -> dict:
+    """Return errors changed after ``since`` plus tombstones for deleted ids, ordered by version."""
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            if since is None:
+                column, value = "version", 0
+            else:
+                column, value = parse_since(since)
+            cursor.execute(
+                f"SELECT error_id, version, deleted FROM error_changes WHERE {column} > ? ORDER BY version LIMIT ?",
+                (value, limit + 1)
+            )
+            changes = cursor.fetchall()
+            has_more = len(changes) > limit
+            changes = changes[:limit]
+            if has_more:
+                token = changes[-1][1]
+            else:
+                token = cursor.execute("SELECT version FROM sync_state WHERE id = 1").fetchone()[0]
+
+            changed_ids = [error_id for error_id, _, deleted in changes if not deleted]
+            errors = load_changed_errors(conn, changed_ids, include_content)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch changes: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch changes: {str(e)}")
+
+    items = [errors[error_id] for error_id in changed_ids if error_id in errors]
+    deleted = [error_id for error_id, _, is_deleted in changes if is_deleted]
+    logger.debug(f"Delta since {since}: {len(items)} changed, {len(deleted)} deleted")
+    return {"items": items, "deleted": deleted, "since": str(token), "has_more": has_more}
+
+@app.get("/api/errors/changes", response_model=ErrorChanges)
+async def get_error_changes(
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    include_content: bool = False,
+):
+    """Incremental sync: pass the returned ``since`` token back to receive only later changes."""
+    return await run_blocking(fetch_error_changes, since, limit, include_content)
+
+# Live change feed (Server-Sent Events)
+FEED_POLL_SECONDS = float(os.environ.get("FEED_POLL_SECONDS", 1.0))
+FEED_HEARTBEAT_SECONDS = 15.0
+FEED_BUFFER_EVENTS = 1000
+FEED_BATCH_SIZE = 200
+FEED_RETRY_MS = 3000
+
+def read_feed_events(after: int, limit: int) -> tuple:
+    """Load change events after a version with each error's current state; returns (events, last version read)."""
+    previous_columns = ", ".join(f"previous_{field}" for field in PREVIOUS_FIELDS)
+    with db_connection() as conn:
+        oldest = conn.execute("SELECT MIN(version) FROM error_events").fetchone()[0]
+        if oldest is not None and after >= oldest - 1:
+            changes = conn.execute(
+                f"SELECT error_id, version, event = 'deleted', event, {previous_columns} FROM error_events WHERE version > ? ORDER BY version LIMIT ?",
+                (after, limit)
+            ).fetchall()
+        else:
+            # Behind the event log: replay the latest change of each error instead
+            changes = conn.execute(
+                f"SELECT error_id, version, deleted, event, {previous_columns} FROM error_changes WHERE version > ? ORDER BY version LIMIT ?",
+                (after, limit)
+            ).fetchall()
+        errors = load_changed_errors(conn, list({row[0] for row in changes if not row[2]}), False)
+    events = []
+    for error_id, version, deleted, event, *previous in changes:
+        error = None if deleted else errors.get(error_id)
+        if not deleted and error is None:
+            # Deleted since the changes were read; its tombstone arrives with a later version
+            continue
+        events.append({
+            "type": event or ("deleted" if deleted else "updated"),
+            "id": error_id,
+            "version": version,
+            "error": error,
+            "previous": previous_state(event, previous),
+        })
+    return events, changes[-1][1] if changes else after
+
+def previous_state(event: Optional[str], values: list) -> Optional[dict]:
+    """The filterable fields before a change; None when unknown (changes recorded before they were kept)."""
+    if event == "created" or all(value is None for value in values):
+        return None
+    previous = dict(zip(PREVIOUS_FIELDS, values))
+    previous["tags"] = json.loads(previous["tags"]) if previous["tags"] else []
+    return previous
+
+class ChangeFeed:
+    """Per-process broadcaster that polls the table version while clients are connected.
+
+    Recent events are kept in a bounded ring shared by all clients; a client that has fallen
+    behind the ring (slow consumer or Last-Event-ID replay) is served from error_changes instead,
+    so nothing is buffered per client.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.floor = 0
+        self.events: deque = deque()
+        self.subscribers = 0
+        self.changed = asyncio.Condition()
+        self.wakeup = asyncio.Event()
+        self.starting = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+
+    async def subscribe(self):
+        self.subscribers += 1
+        async with self.starting:
+            if self.task is None:
+                self.version = self.floor = await run_blocking(current_version)
+                self.events.clear()
+                # Fresh primitives bind to whichever event loop is serving the app now
+                self.changed = asyncio.Condition()
+                self.wakeup = asyncio.Event()
+                self.task = asyncio.create_task(self.run())
+
+    def unsubscribe(self):
+        self.subscribers -= 1
+
+    def notify(self):
+        """Wake the poller right away after a local write instead of waiting for the next poll."""
+        self.wakeup.set()
+
+    async def run(self):
+        try:
+            while self.subscribers > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), FEED_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeup.clear()
+                while True:
+                    events, last = await run_blocking(read_feed_events, self.version, FEED_BATCH_SIZE)
+                    if last == self.version:
+                        break
+                    self.events.extend(events)
+                    while len(self.events) > FEED_BUFFER_EVENTS:
+                        self.floor = self.events.popleft()["version"]
+                    self.version = last
+                    async with self.changed:
+                        self.changed.notify_all()
+        except Exception as e:
+            logger.error(f"Change feed stopped: {str(e)}")
+        finally:
+            self.task = None
+            logger.debug("Change feed idle")
+
+    async def events_after(self, last: int) -> tuple:
+        if last >= self.floor:
+            events = [event for event in self.events if event["version"] > last][:FEED_BATCH_SIZE]
+            return events, events[-1]["version"] if events else last
+        return await run_blocking(read_feed_events, last, FEED_BATCH_SIZE)
+
+    async def wait(self, last: int, timeout: float) -> bool:
+        async with self.changed:
+            try:
+                await asyncio.wait_for(self.changed.wait_for(lambda: self.version > last), timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+
+change_feed = ChangeFeed()
+
+def error_matches(error: dict, filters: dict) -> bool:
+    for column in ("severity", "status", "category"):
+        if filters.get(column) and error.get(column) != filters[column]:
+            return False
+    return not filters.get("tag") or filters["tag"] in error.get("tags", [])
+
+def feed_message(event: dict, filters: dict) -> Optional[str]:
+    """Format a change for a client, or return None if nothing it could be showing is affected."""
+    event_type, error = event["type"], event["error"]
+    if error is None or not error_matches(error, filters):
+        # Only a client that may be showing the error under these filters needs to hear that it is gone
+        previous = event["previous"]
+        if event_type == "created" or (previous is not None and not error_matches(previous, filters)):
+            return None
+        if error is not None:
+            event_type, error = "removed", None
+    data = json.dumps({"type": event_type, "id": event["id"], "version": event["version"], "error": error})
+    return f"id: {event['version']}\nevent: {event_type}\ndata: {data}\n\n"
+
+async def stream_events(request: Request, last_event_id: Optional[int], filters: dict):
+    await change_feed.subscribe()
+    try:
+        last = change_feed.version if last_event_id is None else min(last_event_id, change_feed.version)
+        yield f"retry: {FEED_RETRY_MS}\n\n"
+        while not await request.is_disconnected():
+            events, last_read = await change_feed.events_after(last)
+            # Each yield waits for the send to complete, so a slow client holds back only itself
+            for event in events:
+                message = feed_message(event, filters)
+                if message:
+                    yield message
+            if last_read > last:
+                last = last_read
+                continue
+            if not await change_feed.wait(last, FEED_HEARTBEAT_SECONDS):
+                yield ": keepalive\n\n"
+    finally:
+        change_feed.unsubscribe()
+
+@app.get("/api/events")
+async def error_events(
+    request: Request,
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """Server-Sent Events stream of error created/updated/deleted/file_attached events.
+
+    Reconnecting clients resume after Last-Event-ID (header or query parameter); replayed events
+    carry each error's current state rather than every intermediate edit.
+    """
+    resume = last_event_id_header or last_event_id
+    if resume is not None and not resume.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    filters = {"severity": severity, "status": status, "category": category, "tag": tag}
+    return StreamingResponse(
+        stream_events(request, int(resume) if resume is not None else None, filters),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Bulk import and export
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", 1000))
+BULK_MAX_REPORTED_ERRORS = 1000
+BULK_QUEUE_CHUNKS = 16
+BULK_FIELDS = ERROR_COLUMNS.split(", ") + ["resolved_at"]
+BULK_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+class QueueReader(io.RawIOBase):
+    """Blocking byte stream over chunks handed across from the event loop; None marks the end."""
+
+    def __init__(self, chunks: queue.Queue):
+        self.chunks = chunks
+        self.buffer = b""
+        self.eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self.buffer and not self.eof:
+            chunk = self.chunks.get()
+            if chunk is None:
+                self.eof = True
+            else:
+                self.buffer = chunk
+        size = min(len(target), len(self.buffer))
+        target[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+    def drain(self):
+        while not self.eof:
+            if self.chunks.get() is None:
+                self.eof = True
+
+def parse_bulk_tags(value) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return normalize_tags(value)
+    if isinstance(value, str):
+        if value.lstrip().startswith("["):
+            tags = json.loads(value)
+            if not isinstance(tags, list):
+                raise ValueError("tags must be a list")
+            return normalize_tags(tags)
+        return normalize_tags(value.split(","))
+    raise ValueError("tags must be a list or a comma-separated string")
+
+def validate_bulk_record(record: dict, now: str) -> tuple:
+    """Validate one imported record and return it as a row tuple in BULK_FIELDS order."""
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+    for field in ("title", "description", "severity", "status"):
+        if not record.get(field):
+            raise ValueError(f"missing required field '{field}'")
     try:
-        # Fetch all errors
-        with sqlite3.connect(DB_FILE) as conn:
+        validate_error_fields(record["severity"], record["status"])
+    except HTTPException as e:
+        raise ValueError(e.detail)
+    created_at = record.get("created_at") or now
+    updated_at = record.get("updated_at") or created_at
+    resolved_at = (record.get("resolved_at") or updated_at) if record["status"] == "resolved" else None
+    for value in (created_at, updated_at, resolved_at):
+        if value:
+            datetime.fromisoformat(value)
+    return (
+        record.get("id") or str(uuid.uuid4()),
+        str(record["title"]),
+        str(record["description"]),
+        record["severity"],
+        record.get("category") or None,
+        json.dumps(parse_bulk_tags(record.get("tags"))),
+        record.get("solution") or None,
+        record["status"],
+        created_at,
+        updated_at,
+        resolved_at,
+    )
+
+def iter_bulk_records(stream, fmt: str):
+    """Yield (line number, record or parse exception) from an NDJSON or CSV text stream."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+def insert_bulk_batch(batch: List[tuple], upsert: bool, report: dict):
+    """Insert one batch of validated rows in a single transaction, reporting rows that fail."""
+    placeholders = ", ".join("?" for _ in BULK_FIELDS)
+    statement = f"INSERT INTO errors ({', '.join(BULK_FIELDS)}) VALUES ({placeholders})"
+    if upsert:
+        updates = ", ".join(f"{field} = excluded.{field}" for field in BULK_FIELDS[1:])
+        statement += f" ON CONFLICT(id) DO UPDATE SET {updates}"
+    with db_connection() as conn:
+        begin_write(conn)
+        if not upsert:
+            ids = [row[1][0] for row in batch]
+            placeholders_in = ", ".join("?" for _ in ids)
+            existing = {row[0] for row in conn.execute(f"SELECT id FROM errors WHERE id IN ({placeholders_in})", ids)}
+            seen = set()
+            accepted = []
+            for line_number, row in batch:
+                if row[0] in existing or row[0] in seen:
+                    record_bulk_error(report, line_number, f"duplicate id '{row[0]}'")
+                else:
+                    seen.add(row[0])
+                    accepted.append((line_number, row))
+            batch = accepted
+        else:
+            # Upserted rows are re-fingerprinted by the backfill after the import
+            ids = [row[0] for _, row in batch]
+            conn.execute(f"DELETE FROM error_fingerprints WHERE error_id IN ({', '.join('?' for _ in ids)})", ids)
+            conn.execute(f"DELETE FROM error_lsh WHERE error_id IN ({', '.join('?' for _ in ids)})", ids)
+        try:
+            conn.executemany(statement, [row for _, row in batch])
+            report["imported"] += len(batch)
+        except sqlite3.DatabaseError:
+            # Fall back to row-by-row inserts to pinpoint the failing records
+            conn.rollback()
+            begin_write(conn)
+            for line_number, row in batch:
+                try:
+                    conn.execute(statement, row)
+                    report["imported"] += 1
+                except sqlite3.DatabaseError as e:
+                    record_bulk_error(report, line_number, str(e))
+        conn.commit()
+
+def record_bulk_error(report: dict, line_number: int, message: str):
+    report["failed"] += 1
+    if len(report["errors"]) < BULK_MAX_REPORTED_ERRORS:
+        report["errors"].append({"line": line_number, "error": message})
+    else:
+        report["errors_truncated"] = True
+
+def import_error_records(chunks: queue.Queue, fmt: str, upsert: bool) -> dict:
+    """Consume the request body from the queue, validating rows and inserting them in batches."""
+    report = {"imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    reader = QueueReader(chunks)
+    try:
+        stream = io.TextIOWrapper(io.BufferedReader(reader), encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+        now = datetime.now().isoformat()
+        batch: List[tuple] = []
+        for line_number, record in iter_bulk_records(stream, fmt):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                batch.append((line_number, validate_bulk_record(record, now)))
+            except (ValueError, TypeError) as e:
+                record_bulk_error(report, line_number, str(e))
+            if len(batch) >= BULK_BATCH_SIZE:
+                insert_bulk_batch(batch, upsert, report)
+                batch = []
+        if batch:
+            insert_bulk_batch(batch, upsert, report)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Malformed {fmt} input: {str(e)}")
+    finally:
+        # Keep consuming so the request side never blocks on a full queue
+        reader.drain()
+    logger.info(f"Bulk import finished: {report['imported']} imported, {report['failed']} failed")
+    return report
+
+def resolve_bulk_format(fmt: Optional[str], content_type: Optional[str]) -> str:
+    if fmt:
+        if fmt not in BULK_FORMATS:
+            raise HTTPException(status_code=400, detail="Invalid format; use ndjson or csv")
+        return fmt
+    return "csv" if content_type and "csv" in content_type else "ndjson"
+
+def iter_bulk_export(fmt: str):
+    """Yield the errors table as NDJSON or CSV, one keyset page per database round trip."""
+    after = None
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(BULK_FIELDS)
+        yield buffer.getvalue()
+    while True:
+        with db_connection() as conn:
+            if after:
+                rows = conn.execute(
+                    f"SELECT {ERROR_COLUMNS}, resolved_at FROM errors WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?",
+                    (*after, BULK_BATCH_SIZE)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {ERROR_COLUMNS}, resolved_at FROM errors ORDER BY created_at, id LIMIT ?", (BULK_BATCH_SIZE,)
+                ).fetchall()
+        if not rows:
+            break
+        after = (rows[-1][8], rows[-1][0])
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(["" if value is None else value for value in row])
+            yield buffer.getvalue()
+        else:
+            yield "".join(json.dumps({**row_to_error(row), "resolved_at": row[10]}) + "\n" for row in rows)
+
+@app.post("/api/errors/import")
+async def import_errors(request: Request, format: Optional[str] = None, upsert: bool = False):
+    fmt = resolve_bulk_format(format, request.headers.get("content-type"))
+    loop = asyncio.get_running_loop()
+    chunks: queue.Queue = queue.Queue(maxsize=BULK_QUEUE_CHUNKS)
+    importer = asyncio.ensure_future(run_in(get_import_executor(), import_error_records, chunks, fmt, upsert))
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                # The bounded queue applies backpressure to the upload when the importer falls behind
+                await loop.run_in_executor(None, chunks.put, chunk)
+    finally:
+        await loop.run_in_executor(None, chunks.put, None)
+    report = await importer
+    change_feed.notify()
+    schedule_fingerprint_backfill()
+    return report
+
+@app.get("/api/errors/export")
+async def export_errors(format: str = "ndjson"):
+    if format not in BULK_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format; use ndjson or csv")
+    filename = f"errors_{datetime.now().strftime('%Y-%m-%d')}.{format}"
+    return StreamingResponse(
+        iter_bulk_export(format),
+        media_type=BULK_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# Aggregate statistics
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 365
+STATS_DEFAULT_TOP_TAGS = 10
+
+def fetch_error_stats(days: int, top_tags: int) -> dict:
+    """Read the trigger-maintained counters; the cost depends on the requested window, not the table size."""
+    try:
+        with db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM errors")
-            errors = [
-                {
-                    "No": row[0],  # row number
-                    "title": row[1],
-                    "description": row[2],
-                    "severity": row[3],
-                    "category": row[4],
-                    "tags": json.loads(row[5]) if row[5] else [],
-                    "solution": row[6],
-                    "status": row[7],
-                    "created_at": row[8],
-                    "updated_at": row[9],
-                    "files": get_files_for_error(row[0])
-                }
-                for row in cursor.fetchall()
-            ]
-            logger.info(f"Fetched {len(errors)} errors for Word export")
-
-        # Create Word document
-        doc = Document()
-        doc.add_heading('Error Log Report', 0)
-
-        # Set 1cm margins for all sections
-        for section in doc.sections:
-            section.top_margin = Cm(0.7)
-            section.bottom_margin = Cm(0.7)
-            section.left_margin = Cm(0.7)
-            section.right_margin = Cm(0.7)
-
-        # Add error data and images in Word format
-        for idx, error in enumerate(errors, 1):
-            doc.add_heading(f'Record {idx}', level=1)
-            doc.add_paragraph(f"Title: {error['title'] or 'N/A'}")
-            doc.add_paragraph(f"Description: {error['description'] or 'N/A'}")
-            doc.add_paragraph(f"Severity Fleischman: {error['severity'] or 'N/A'}")
-            doc.add_paragraph(f"Category: {error['category'] or 'N/A'}")
-            doc.add_paragraph(f"Tags: {', '.join(error['tags']) or 'None'}")
-            doc.add_paragraph(f"Solution: {error['solution'] or 'N/A'}")
-            doc.add_paragraph(f"Status: {error['status'] or 'N/A'}")
-            doc.add_paragraph(f"Created At: {datetime.fromisoformat(error['created_at']).strftime('%Y-%m-%d %H:%M:%S') if error['created_at'] else 'N/A'}")
-            doc.add_paragraph(f"Updated At: {datetime.fromisoformat(error['updated_at']).strftime('%Y-%m-%d %H:%M:%S') if error['updated_at'] else 'N/A'}")
-            doc.add_paragraph(f"Files: {', '.join(file['filename'] for file in error['files']) or 'None'}")
+            cursor.execute(
+                "SELECT metric, key, count, total FROM error_stats WHERE metric IN ('severity', 'status', 'category', 'resolution') AND count > 0"
+            )
+            breakdowns = {"severity": {}, "status": {}, "category": {}}
+            resolution = (0, 0.0)
+            for metric, key, count, total in cursor.fetchall():
+                if metric == "resolution":
+                    resolution = (count, total)
+                else:
+                    breakdowns[metric][key] = count
+            cursor.execute(
+                "SELECT name, error_count FROM tags WHERE error_count > 0 ORDER BY error_count DESC, name LIMIT ?",
+                (top_tags,)
+            )
+            tags = [{"tag": name, "count": count} for name, count in cursor.fetchall()]
+            first_day = datetime.now().date().toordinal() - days + 1
+            start = datetime.fromordinal(first_day).date().isoformat()
+            cursor.execute(
+                "SELECT metric, key, count FROM error_stats WHERE metric IN ('opened', 'resolved') AND key >= ?",
+                (start,)
+            )
+            daily = {}
+            for metric, key, count in cursor.fetchall():
+                daily.setdefault(key, {"opened": 0, "resolved": 0})[metric] = count
+    except Exception as e:
+        logger.error(f"Failed to fetch statistics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch statistics: {str(e)}")
+
+    series = []
+    for ordinal in range(first_day, first_day + days):
+        day = datetime.fromordinal(ordinal).date().isoformat()
+        series.append({"date": day, **daily.get(day, {"opened": 0, "resolved": 0})})
+    resolved_count, resolved_days = resolution
+    return {
+        "total": sum(breakdowns["status"].values()),
+        "by_severity": breakdowns["severity"],
+        "by_status": breakdowns["status"],
+        "by_category": breakdowns["category"],
+        "top_tags": tags,
+        "daily": series,
+        "mean_time_to_resolution_hours": round(resolved_days * 24 / resolved_count, 2) if resolved_count else None,
+    }
+
+@app.get("/api/stats")
+async def get_stats(
+    days: int = Query(STATS_DEFAULT_DAYS, ge=1, le=STATS_MAX_DAYS),
+    top_tags: int = Query(STATS_DEFAULT_TOP_TAGS, ge=1, le=100),
+):
+    return await run_blocking(fetch_error_stats, days, top_tags)
+
+# Tags
+DEFAULT_TAG_LIMIT = 50
+MAX_TAG_LIMIT = 500
+
+def tag_prefix_condition(prefix: Optional[str]) -> tuple:
+    """Case-insensitive prefix match written as a range so it can use idx_tags_name_nocase."""
+    if not prefix:
+        return "", []
+    return "AND name COLLATE NOCASE >= ? AND name COLLATE NOCASE < ?", [prefix, prefix + "\U0010ffff"]
+
+def fetch_tag_counts(prefix: Optional[str], limit: int) -> List[dict]:
+    try:
+        with db_connection() as conn:
+            condition, params = tag_prefix_condition(prefix)
+            rows = conn.execute(
+                f"SELECT name, error_count FROM tags WHERE error_count > 0 {condition} ORDER BY error_count DESC, name LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+            return [{"tag": name, "count": count} for name, count in rows]
+    except Exception as e:
+        logger.error(f"Failed to fetch tags: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch tags: {str(e)}")
+
+@app.get("/api/tags")
+async def list_tags(
+    prefix: Optional[str] = None,
+    limit: int = Query(DEFAULT_TAG_LIMIT, ge=1, le=MAX_TAG_LIMIT),
+):
+    """Tags with the number of errors carrying each, most used first."""
+    return await run_blocking(fetch_tag_counts, prefix, limit)
+
+@app.get("/api/tags/autocomplete")
+async def autocomplete_tags(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+):
+    return [hit["tag"] for hit in await run_blocking(fetch_tag_counts, q.strip(), limit)]
+
+@app.get("/api/errors/{error_id}", response_model=ErrorResponse)
+async def get_error(request: Request, response: Response, error_id: str, include_content: bool = False):
+    version = await run_blocking(error_version, error_id)
+    if version is not None:
+        etag = f'W/"{version}{"-content" if include_content else ""}"'
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_version_headers(response, etag)
+    return await run_blocking(fetch_error, error_id, include_content)
+
+@app.put("/api/errors/{error_id}", response_model=ErrorResponse)
+async def update_error(
+    error_id: str,
+    title: str = Form(...),
+    description: str = Form(...),
+    severity: str = Form(...),
+    category: Optional[str] = Form(None),
+    tags: str = Form("[]"),
+    solution: Optional[str] = Form(None),
+    status: str = Form(...),
+    files: List[UploadFile] = File([])
+):
+    tags_list = normalize_tags(json.loads(tags))
+    validate_error_fields(severity, status)
+
+    error = {
+        "id": error_id,
+        "title": title,
+        "description": description,
+        "severity": severity,
+        "category": category,
+        "tags": tags_list,
+        "solution": solution,
+        "status": status,
+    }
+    updated = await run_blocking(update_error_record, error, files)
+    change_feed.notify()
+    return updated
+
+def fetch_similar_errors(error_id: str, limit: int, min_score: float) -> List[dict]:
+    try:
+        with db_connection() as conn:
+            row = conn.execute(
+                "SELECT e.title, e.description, f.signature FROM errors e LEFT JOIN error_fingerprints f ON f.error_id = e.id WHERE e.id = ?",
+                (error_id,)
+            ).fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="Error not found")
+            signature = array("I", row[2]) if row[2] else error_signature(row[0], row[1])
+            return find_similar(conn, signature, error_id, limit, min_score)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to find similar errors for {error_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to find similar errors: {str(e)}")
+
+@app.get("/api/errors/{error_id}/similar", response_model=List[SimilarError])
+async def get_similar_errors(
+    error_id: str,
+    limit: int = Query(DUPLICATE_LIMIT, ge=1, le=50),
+    min_score: float = Query(DUPLICATE_MIN_SCORE, ge=0.0, le=1.0),
+):
+    return await run_blocking(fetch_similar_errors, error_id, limit, min_score)
+
+@app.delete("/api/errors/{error_id}")
+async def delete_error(error_id: str):
+    await run_blocking(delete_error_record, error_id)
+    change_feed.notify()
+    return {"message": "Error deleted successfully"}
+
+@app.get("/api/files/{file_id}")
+async def get_file(file_id: str):
+    return JSONResponse(content=await run_blocking(read_file_payload, file_id))
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def file_etag(stat_result: os.stat_result) -> str:
+    token = f"{stat_result.st_mtime_ns}-{stat_result.st_size}".encode("utf-8")
+    return f'"{hashlib.md5(token).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> Optional[bool]:
+    """Weakly compare If-None-Match against an ETag; None when the header is absent."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or opaque in candidates or f"W/{opaque}" in candidates
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    matches = etag_matches(request, etag)
+    if matches is not None:
+        return matches
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def parse_range(range_header: str, size: int) -> Optional[tuple]:
+    """Parse a single-range ``Range`` header into an inclusive (start, end) pair.
+
+    Returns None when the header should be ignored (multiple or malformed ranges)
+    and raises a 416 when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+def iter_blob_range(filepath: str, encoding: Optional[str], start: int, end: int):
+    """Yield bytes start..end (inclusive) of a stored blob's original content."""
+    with open_blob(filepath, encoding) as f:
+        # Seeking a compressed blob decompresses and discards everything before start
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            record_upload_io("read", len(chunk))
+            yield chunk
+
+def content_disposition(filename: str, disposition: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+async def serve_file(
+    request: Request,
+    filepath: str,
+    filename: str,
+    mimetype: Optional[str],
+    inline: bool = False,
+    cache_control: str = "private, max-age=0, must-revalidate",
+    encoding: Optional[str] = None,
+    size: Optional[int] = None,
+):
+    """Stream a file from disk with conditional GET and single-range support.
+
+    Compressed blobs (``encoding`` set, ``size`` their original size) are sent as stored
+    with Content-Encoding: gzip when the client accepts it and wants the whole file, and
+    are decompressed as they stream otherwise.
+    """
+    try:
+        stat_result = await run_blocking(os.stat, filepath)
+    except OSError:
+        logger.warning(f"File missing on disk: {filepath}")
+        raise HTTPException(status_code=404, detail="File not found")
+
+    if not mimetype or mimetype == "application/octet-stream":
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    if encoding is None:
+        size = stat_result.st_size
+    range_header = request.headers.get("range")
+    passthrough = encoding == "gzip" and not range_header and "gzip" in request.headers.get("accept-encoding", "")
+    etag = file_etag(stat_result)
+    if passthrough:
+        # The gzip body is a different representation, so it needs its own validator
+        etag = f'{etag[:-1]}-gzip"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+    }
+    if encoding:
+        headers["Vary"] = "Accept-Encoding"
+    disposition = "inline" if inline else "attachment"
+
+    if is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range == etag):
+        byte_range = parse_range(range_header, size)
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            logger.debug(f"Streaming bytes {start}-{end} of file: {filename}")
+            return StreamingResponse(
+                iter_blob_range(filepath, encoding, start, end),
+                status_code=206,
+                media_type=mimetype,
+                headers=headers,
+            )
+
+    if encoding and not passthrough:
+        logger.debug(f"Streaming decompressed file: {filename}")
+        headers["Content-Length"] = str(size)
+        headers["Content-Disposition"] = content_disposition(filename, disposition)
+        return StreamingResponse(iter_blob_range(filepath, encoding, 0, size - 1), media_type=mimetype, headers=headers)
+    if passthrough:
+        headers["Content-Encoding"] = "gzip"
+
+    # FileResponse streams from disk and uses the server's sendfile path when available
+    logger.debug(f"Streaming file: {filename}")
+    record_upload_io("read", stat_result.st_size)
+    return FileResponse(
+        filepath,
+        media_type=mimetype,
+        filename=filename,
+        stat_result=stat_result,
+        headers=headers,
+        content_disposition_type=disposition,
+    )
+
+@app.get("/api/files/{file_id}/download")
+async def download_file(file_id: str, request: Request, inline: bool = False):
+    filepath, filename, mimetype, encoding, size = await run_blocking(fetch_file_record, file_id)
+    return await serve_file(request, filepath, filename, mimetype, inline, encoding=encoding, size=size)
+
+# Downscaled image renditions, stored beside the original as <file id>.<rendition>.<ext>
+RENDITION_SIZES = {"thumb": 320, "export": 1000}
+RENDITION_JPEG_QUALITY = 82
+# Renditions of an upload never change, so clients may cache them for a long time
+RENDITION_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+def rendition_paths(filepath: str) -> List[str]:
+    base = os.path.splitext(filepath)[0]
+    return [f"{base}.{name}.{ext}" for name in RENDITION_SIZES for ext in ("jpg", "png")]
+
+@lru_cache(maxsize=None)
+def load_pillow() -> Optional[tuple]:
+    """Import Pillow on first use and return (Image, ImageOps), or None if it is not installed."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:  # Pillow is optional; without it images are served and exported at full size
+        return None
+    return Image, ImageOps
+
+def ensure_rendition(filepath: str, mimetype: str, rendition: str, encoding: Optional[str] = None) -> Optional[tuple]:
+    """Return (path, mimetype) of a downscaled copy of an image, creating it on first use.
+
+    Returns None when Pillow is not installed or the file is not a raster image it
+    can read; callers fall back to the original file.
+    """
+    pillow = load_pillow()
+    if pillow is None or not mimetype.startswith("image/") or mimetype == "image/svg+xml":
+        return None
+    PILImage, ImageOps = pillow
+    base = os.path.splitext(filepath)[0]
+    for ext, rendition_mimetype in (("jpg", "image/jpeg"), ("png", "image/png")):
+        path = f"{base}.{rendition}.{ext}"
+        if os.path.exists(path):
+            return path, rendition_mimetype
+
+    max_size = RENDITION_SIZES[rendition]
+    try:
+        with timed_phase("rendition"), open_blob(filepath, encoding) as source, PILImage.open(source) as image:
+            # Let the JPEG decoder downscale while decoding instead of loading full resolution
+            image.draft("RGB", (max_size, max_size))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_size, max_size))
+            has_alpha = image.mode in ("RGBA", "LA", "P") and (image.mode != "P" or "transparency" in image.info)
+            if has_alpha:
+                ext, rendition_mimetype, fmt, options = "png", "image/png", "PNG", {"optimize": True}
+                image = image.convert("RGBA")
+            else:
+                ext, rendition_mimetype, fmt, options = "jpg", "image/jpeg", "JPEG", {"quality": RENDITION_JPEG_QUALITY, "optimize": True}
+                image = image.convert("RGB")
+            path = f"{base}.{rendition}.{ext}"
+            partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+            image.save(partial_path, fmt, **options)
+        os.replace(partial_path, path)
+        record_upload_io("read", os.path.getsize(filepath))
+        record_upload_io("written", os.path.getsize(path))
+        logger.debug(f"Created {rendition} rendition: {path}")
+        return path, rendition_mimetype
+    except Exception as e:
+        logger.warning(f"Failed to create {rendition} rendition for {filepath}: {str(e)}")
+        return None
+
+@app.get("/api/files/{file_id}/thumbnail")
+async def get_thumbnail(file_id: str, request: Request, rendition: str = "thumb"):
+    if rendition not in RENDITION_SIZES:
+        raise HTTPException(status_code=400, detail="Invalid rendition")
+    filepath, filename, mimetype, encoding, size = await run_blocking(fetch_file_record, file_id)
+    if not (mimetype or "").startswith("image/"):
+        raise HTTPException(status_code=400, detail="File is not an image")
+    result = await run_blocking(ensure_rendition, filepath, mimetype, rendition, encoding)
+    if result:
+        (filepath, mimetype), encoding = result, None
+    return await serve_file(
+        request, filepath, filename, mimetype, inline=True, cache_control=RENDITION_CACHE_CONTROL, encoding=encoding, size=size,
+    )
+
+# Resumable uploads: clients create a session, send chunks at the current offset
+# with a per-chunk SHA-256, and attach the finished upload to an error.
+UPLOAD_MAX_CHUNK_BYTES = int(os.environ.get("UPLOAD_MAX_CHUNK_BYTES", 8 * 1024 * 1024))
+UPLOAD_RECOMMENDED_CHUNK_BYTES = 4 * 1024 * 1024
+UPLOAD_SESSION_TTL_SECONDS = int(os.environ.get("UPLOAD_SESSION_TTL_SECONDS", 24 * 3600))
+UPLOAD_COLUMNS = "id, filename, mimetype, size, received, sha256, created_at, updated_at"
+
+# Running whole-file hashes per upload as (offset hashed up to, hasher). Only kept while one process
+# sees consecutive chunks; never rebuilt under the write lock, upload_digest rereads the file instead
+upload_hashers: Dict[str, tuple] = {}
+upload_hashers_lock = threading.Lock()
+
+class UploadCreate(BaseModel):
+    filename: str
+    size: int
+    mimetype: Optional[str] = None
+    sha256: Optional[str] = None
+
+class UploadAttach(BaseModel):
+    upload_id: str
+
+def upload_partial_path(upload_id: str) -> str:
+    return os.path.join(incoming_dir(), f"{upload_id}.upload")
+
+def row_to_upload(row) -> dict:
+    return {
+        "id": row[0],
+        "filename": row[1],
+        "mimetype": row[2],
+        "size": row[3],
+        "received": row[4],
+        "sha256": row[5],
+        "created_at": row[6],
+        "updated_at": row[7],
+        "complete": row[4] == row[3],
+        "chunk_size": UPLOAD_RECOMMENDED_CHUNK_BYTES,
+        "max_chunk_size": UPLOAD_MAX_CHUNK_BYTES,
+    }
+
+def fetch_upload(conn: sqlite3.Connection, upload_id: str) -> dict:
+    row = conn.execute(f"SELECT {UPLOAD_COLUMNS} FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return row_to_upload(row)
+
+def expire_uploads():
+    cutoff = datetime.fromtimestamp(time.time() - UPLOAD_SESSION_TTL_SECONDS).isoformat()
+    with db_connection() as conn:
+        expired = [row[0] for row in conn.execute("SELECT id FROM uploads WHERE updated_at < ?", (cutoff,)).fetchall()]
+        for upload_id in expired:
+            conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+            discard_upload_state(upload_id)
+    if expired:
+        logger.info(f"Expired {len(expired)} stale upload sessions")
+
+def discard_upload_state(upload_id: str):
+    with upload_hashers_lock:
+        upload_hashers.pop(upload_id, None)
+    path = upload_partial_path(upload_id)
+    if os.path.exists(path):
+        remove_file_quietly(path)
+
+def create_upload_session(upload: UploadCreate) -> dict:
+    if not upload.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+    if upload.size < 0:
+        raise HTTPException(status_code=400, detail="Invalid upload size")
+    if upload.size > MAX_FILE_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_FILE_BYTES} byte limit")
+    if upload.sha256 and not re.fullmatch(r"[0-9a-fA-F]{64}", upload.sha256):
+        raise HTTPException(status_code=400, detail="Invalid sha256 digest")
+    expire_uploads()
+
+    upload_id = str(uuid.uuid4())
+    now = datetime.now().isoformat()
+    open(upload_partial_path(upload_id), "wb").close()
+    with db_connection() as conn:
+        conn.execute(
+            f"INSERT INTO uploads ({UPLOAD_COLUMNS}) VALUES (?, ?, ?, ?, 0, ?, ?, ?)",
+            (upload_id, upload.filename, upload.mimetype or "application/octet-stream", upload.size,
+             upload.sha256.lower() if upload.sha256 else None, now, now)
+        )
+        conn.commit()
+        logger.info(f"Upload session {upload_id} created for {upload.filename} ({upload.size} bytes)")
+        return fetch_upload(conn, upload_id)
+
+def cached_upload_hash(upload_id: str, offset: int):
+    """Return a copy of this process's running hasher if it covers exactly ``offset`` bytes, else None.
+
+    Copied, so a chunk that fails to persist leaves the cache as it was.
+    """
+    with upload_hashers_lock:
+        state = upload_hashers.get(upload_id)
+    if state and state[0] == offset:
+        return state[1].copy()
+    return None
+
+def upload_digest(upload_id: str, path: str, size: int) -> str:
+    """SHA-256 of a complete upload, from the running hash when this process saw every chunk.
+
+    Otherwise (chunks spread across workers, or a restart) the file is hashed from disk once.
+    Called without the write lock, since a complete upload no longer changes.
+    """
+    hasher = cached_upload_hash(upload_id, size)
+    if hasher is None:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+        record_upload_io("read", size)
+    return hasher.hexdigest()
+
+def append_upload_chunk(upload_id: str, offset: int, chunk_sha256: str, data: bytes) -> dict:
+    if hashlib.sha256(data).hexdigest() != chunk_sha256.lower():
+        raise HTTPException(status_code=422, detail="Chunk checksum mismatch")
+    with db_connection() as conn:
+        # The write lock serializes chunks for the same upload across requests and workers
+        begin_write(conn)
+        upload = fetch_upload(conn, upload_id)
+        if offset != upload["received"]:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Offset mismatch: expected {upload['received']}",
+                headers={"Upload-Offset": str(upload["received"])},
+            )
+        if offset + len(data) > upload["size"]:
+            raise HTTPException(status_code=413, detail="Chunk extends past the declared upload size")
+
+        path = upload_partial_path(upload_id)
+        hasher = cached_upload_hash(upload_id, offset)
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+            f.truncate()
+        record_upload_io("written", len(data))
+        if hasher:
+            hasher.update(data)
+        received = offset + len(data)
+        conn.execute(
+            "UPDATE uploads SET received = ?, updated_at = ? WHERE id = ?",
+            (received, datetime.now().isoformat(), upload_id)
+        )
+        conn.commit()
+        with upload_hashers_lock:
+            if hasher:
+                upload_hashers[upload_id] = (received, hasher)
+            elif offset == 0:
+                upload_hashers[upload_id] = (received, hashlib.sha256(data))
+            else:
+                # Another process took the earlier chunks; upload_digest hashes the file once at the end
+                upload_hashers.pop(upload_id, None)
+        logger.debug(f"Upload {upload_id}: received {received}/{upload['size']} bytes")
+        return fetch_upload(conn, upload_id)
+
+def get_upload_session(upload_id: str) -> dict:
+    with db_connection() as conn:
+        return fetch_upload(conn, upload_id)
+
+def abort_upload_session(upload_id: str):
+    with db_connection() as conn:
+        fetch_upload(conn, upload_id)
+        conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+        conn.commit()
+    discard_upload_state(upload_id)
+    logger.info(f"Upload session {upload_id} aborted")
+
+def attach_upload_to_error(error_id: str, upload_id: str) -> dict:
+    path = upload_partial_path(upload_id)
+    encoded_path = None
+    try:
+        with db_connection() as conn:
+            upload = fetch_upload(conn, upload_id)
+        if not upload["complete"]:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: {upload['received']} of {upload['size']} bytes received",
+                headers={"Upload-Offset": str(upload["received"])},
+            )
+        # A finished upload no longer changes, so it is hashed and compressed before taking the write lock
+        digest = upload_digest(upload_id, path, upload["size"])
+        if upload["sha256"] and digest != upload["sha256"]:
+            raise HTTPException(status_code=422, detail="Upload checksum mismatch")
+        encoded_path, encoding = encode_for_storage(path, upload["mimetype"], upload["filename"], upload["size"])
+        with db_connection() as conn:
+            begin_write(conn)
+            if not conn.execute("SELECT 1 FROM errors WHERE id = ?", (error_id,)).fetchone():
+                logger.warning(f"Error not found for attachment: {error_id}")
+                raise HTTPException(status_code=404, detail="Error not found")
+            # Still there, and so still complete, unless it was aborted or attached meanwhile
+            fetch_upload(conn, upload_id)
+
+            # Bumped before the file is attached, so the feed's last event for this change is file_attached
+            conn.execute("UPDATE errors SET updated_at = ? WHERE id = ?", (datetime.now().isoformat(), error_id))
+            if encoded_path:
+                file_info = attach_blob(conn, error_id, upload["filename"], upload["mimetype"], encoded_path, digest, upload["size"], "gzip")
+            else:
+                file_info = attach_blob(conn, error_id, upload["filename"], upload["mimetype"], path, digest, upload["size"])
+            conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+            conn.commit()
+        if encoded_path and os.path.exists(path):
+            remove_file_quietly(path)
+        with upload_hashers_lock:
+            upload_hashers.pop(upload_id, None)
+        logger.info(f"Upload {upload_id} attached to error {error_id}")
+        return file_info
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to attach upload {upload_id} to error {error_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to attach upload: {str(e)}")
+    finally:
+        if encoded_path and os.path.exists(encoded_path):
+            remove_file_quietly(encoded_path)
+
+@app.post("/api/uploads", status_code=201)
+async def create_upload(upload: UploadCreate):
+    return await run_blocking(create_upload_session, upload)
+
+@app.get("/api/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    upload = await run_blocking(get_upload_session, upload_id)
+    return JSONResponse(content=upload, headers={"Upload-Offset": str(upload["received"])})
+
+@app.patch("/api/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    chunk_sha256: str = Header(..., alias="X-Chunk-SHA256"),
+):
+    content_length = request.headers.get("content-length")
+    if content_length is not None and not content_length.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if content_length and int(content_length) > UPLOAD_MAX_CHUNK_BYTES:
+        raise HTTPException(status_code=413, detail=f"Chunks are limited to {UPLOAD_MAX_CHUNK_BYTES} bytes")
+    data = bytearray()
+    async for piece in request.stream():
+        data.extend(piece)
+        if len(data) > UPLOAD_MAX_CHUNK_BYTES:
+            raise HTTPException(status_code=413, detail=f"Chunks are limited to {UPLOAD_MAX_CHUNK_BYTES} bytes")
+    upload = await run_blocking(append_upload_chunk, upload_id, upload_offset, chunk_sha256, bytes(data))
+    return JSONResponse(content=upload, headers={"Upload-Offset": str(upload["received"])})
+
+@app.delete("/api/uploads/{upload_id}")
+async def delete_upload(upload_id: str):
+    await run_blocking(abort_upload_session, upload_id)
+    return {"message": "Upload aborted"}
+
+@app.post("/api/errors/{error_id}/files")
+async def attach_upload(error_id: str, attach: UploadAttach):
+    attached = await run_blocking(attach_upload_to_error, error_id, attach.upload_id)
+    change_feed.notify()
+    return attached
+
+# Storage maintenance: compress stored text, move attachments of long-resolved errors
+# to the archive tier and reconcile the files table with UPLOAD_DIR. It runs on a
+# background thread, in one process at a time.
+STORAGE_MAINTENANCE_INTERVAL_SECONDS = int(os.environ.get("STORAGE_MAINTENANCE_INTERVAL_SECONDS", 3600))  # 0 disables
+# Attachments whose errors have all been resolved for this long move to the archive tier; 0 keeps everything hot
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", 0))
+ARCHIVE_COMPRESS_LEVEL = 9
+# Files on disk younger than this are never treated as orphans, so in-flight writes are left alone
+ORPHAN_GRACE_SECONDS = int(os.environ.get("ORPHAN_GRACE_SECONDS", 3600))
+MAINTENANCE_BATCH_SIZE = 500
+# Only names the backend itself creates are ever removed by the sweeper
+BLOB_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(\.gz)?$")
+RENDITION_NAME_PATTERN = re.compile(rf"\.(?:{'|'.join(RENDITION_SIZES)})\.(?:jpg|png)$")
+
+storage_maintenance_stop = threading.Event()
+
+def relocate_blob(old_path: str, old_encoding: Optional[str], digest: str, size: int, archived: bool, level: int) -> bool:
+    """Rewrite a blob into another tier or encoding and repoint every files row that uses it.
+
+    The new copy is in place before the rows change, and the old copy is released only
+    after they have, so a reader always finds one of the two. Returns False if nothing changed.
+    """
+    encoding = old_encoding
+    temp_path = None
+    if old_encoding is None and size >= COMPRESS_MIN_BYTES:
+        temp_path = gzip_to_temp(old_path, size, level)
+        if temp_path:
+            encoding = "gzip"
+    try:
+        new_path = blob_path(digest, encoding, archived)
+        if new_path == old_path:
+            return False
+        if archived:
+            archive_dir()
+        if temp_path is None and not os.path.exists(new_path):
+            temp_path = os.path.join(incoming_dir(), f"{uuid.uuid4().hex}.partial")
+            shutil.copyfile(old_path, temp_path)
+        with db_connection() as conn:
+            begin_write(conn)
+            if temp_path:
+                os.replace(temp_path, new_path)
+            updated = conn.execute(
+                "UPDATE files SET filepath = ?, encoding = ? WHERE filepath = ?",
+                (new_path, encoding, old_path)
+            ).rowcount
+            conn.commit()
+        # If the rows went away meanwhile, the new copy is the one nobody needs
+        release_blobs([old_path] if updated else [new_path])
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            remove_file_quietly(temp_path)
+    return bool(updated)
+
+def compress_stored_blobs(report: dict):
+    """Compress text blobs that were stored as-is, such as those saved before compression existed."""
+    last_path = ""
+    while not storage_maintenance_stop.is_set():
+        with db_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT filepath, MIN(sha256), MIN(size), MIN(mimetype), MIN(filename) FROM files
+                WHERE encoding IS NULL AND sha256 IS NOT NULL AND filepath > ?
+                GROUP BY filepath ORDER BY filepath LIMIT ?
+                """,
+                (last_path, MAINTENANCE_BATCH_SIZE)
+            ).fetchall()
+        if not rows:
+            break
+        last_path = rows[-1][0]
+        for path, digest, size, mimetype, filename in rows:
+            if size < COMPRESS_MIN_BYTES or not is_compressible(mimetype, filename) or not os.path.exists(path):
+                continue
+            archived = os.path.dirname(path) == os.path.join(UPLOAD_DIR, ARCHIVE_DIR_NAME)
+            try:
+                if relocate_blob(path, None, digest, size, archived, ARCHIVE_COMPRESS_LEVEL if archived else COMPRESS_LEVEL):
+                    report["compressed"] += 1
+            except Exception as e:
+                logger.warning(f"Failed to compress blob {path}: {str(e)}")
+
+def archive_resolved_blobs(report: dict):
+    """Move blobs referenced only by errors resolved more than ARCHIVE_AFTER_DAYS ago to the archive tier."""
+    if ARCHIVE_AFTER_DAYS <= 0:
+        return
+    cutoff = datetime.fromtimestamp(time.time() - ARCHIVE_AFTER_DAYS * 24 * 3600).isoformat()
+    archive_prefix = os.path.join(UPLOAD_DIR, ARCHIVE_DIR_NAME) + os.sep
+    last_path = ""
+    while not storage_maintenance_stop.is_set():
+        with db_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT f.filepath, MIN(f.sha256), MIN(f.size), MIN(f.encoding)
+                FROM files f JOIN errors e ON e.id = f.error_id
+                WHERE f.sha256 IS NOT NULL AND f.filepath > ? AND substr(f.filepath, 1, ?) != ?
+                GROUP BY f.filepath
+                HAVING SUM(e.status != 'resolved' OR e.resolved_at IS NULL OR e.resolved_at >= ?) = 0
+                ORDER BY f.filepath LIMIT ?
+                """,
+                (last_path, len(archive_prefix), archive_prefix, cutoff, MAINTENANCE_BATCH_SIZE)
+            ).fetchall()
+        if not rows:
+            break
+        last_path = rows[-1][0]
+        for path, digest, size, encoding in rows:
+            if not os.path.exists(path):
+                continue
+            try:
+                if relocate_blob(path, encoding, digest, size, True, ARCHIVE_COMPRESS_LEVEL):
+                    report["archived"] += 1
+            except Exception as e:
+                logger.warning(f"Failed to archive blob {path}: {str(e)}")
+
+def is_referenced(conn: sqlite3.Connection, path: str) -> bool:
+    match = RENDITION_NAME_PATTERN.search(path)
+    if not match:
+        return conn.execute("SELECT 1 FROM files WHERE filepath = ?", (path,)).fetchone() is not None
+    # A rendition belongs to any blob named <base> or <base>.<ext>
+    base = path[:match.start()]
+    return conn.execute(
+        "SELECT 1 FROM files WHERE filepath = ? OR (filepath >= ? AND filepath < ?) LIMIT 1",
+        (base, base + ".", base + "/")
+    ).fetchone() is not None
+
+def sweep_orphans(report: dict):
+    """Reconcile the files table with the blobs on disk.
+
+    Rows whose blob is missing are repointed at a copy of the same content in another
+    tier or encoding (left behind, for example, by a crash part-way through relocate_blob)
+    and reported if there is none. Blobs, renditions and temp files that nothing refers
+    to are deleted once they are older than ORPHAN_GRACE_SECONDS.
+    """
+    last_path = ""
+    while not storage_maintenance_stop.is_set():
+        with db_connection() as conn:
+            rows = conn.execute(
+                "SELECT filepath, MIN(sha256) FROM files WHERE filepath > ? GROUP BY filepath ORDER BY filepath LIMIT ?",
+                (last_path, MAINTENANCE_BATCH_SIZE)
+            ).fetchall()
+        if not rows:
+            break
+        last_path = rows[-1][0]
+        for path, digest in rows:
+            if os.path.exists(path):
+                continue
+            found = find_blob(digest) if digest else None
+            if not found:
+                report["rows_missing"] += 1
+                logger.warning(f"Attachment missing on disk: {path}")
+                continue
+            with db_connection() as conn:
+                begin_write(conn)
+                conn.execute("UPDATE files SET filepath = ?, encoding = ? WHERE filepath = ?", (found[0], found[1], path))
+                conn.commit()
+            report["rows_repaired"] += 1
+            logger.info(f"Repointed attachments from missing {path} to {found[0]}")
+
+    cutoff = time.time() - ORPHAN_GRACE_SECONDS
+    for directory in (UPLOAD_DIR, os.path.join(UPLOAD_DIR, ARCHIVE_DIR_NAME)):
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if storage_maintenance_stop.is_set():
+                return
+            if not entry.is_file(follow_symlinks=False) or entry.stat().st_mtime > cutoff:
+                continue
+            if not (BLOB_NAME_PATTERN.match(entry.name) or RENDITION_NAME_PATTERN.search(entry.name)):
+                continue
+            with db_connection() as conn:
+                # Checked under the write lock, so a blob being attached right now is seen as referenced
+                begin_write(conn)
+                if is_referenced(conn, entry.path):
+                    continue
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            report["orphans_removed"] += 1
+            report["bytes_freed"] += size
+            logger.info(f"Removed orphaned file: {entry.path}")
+
+    # Temp files from requests that died mid-write; .upload files belong to resumable upload sessions
+    for entry in os.scandir(incoming_dir()):
+        if entry.name.endswith(".partial") and entry.is_file() and entry.stat().st_mtime < cutoff:
+            remove_file_quietly(entry.path)
+            report["temp_files_removed"] += 1
+
+def run_storage_maintenance() -> dict:
+    """Run one pass of orphan sweeping, compression and archiving, and report what changed.
+
+    Raises TimeoutError if another process is already running a pass.
+    """
+    report = {
+        "rows_repaired": 0,
+        "rows_missing": 0,
+        "orphans_removed": 0,
+        "bytes_freed": 0,
+        "temp_files_removed": 0,
+        "compressed": 0,
+        "archived": 0,
+    }
+    with process_lock("maintenance.lock", 0), timed_phase("storage_maintenance"):
+        sweep_orphans(report)
+        compress_stored_blobs(report)
+        archive_resolved_blobs(report)
+    logger.info(f"Storage maintenance finished: {report}")
+    return report
+
+def schedule_storage_maintenance():
+    """Run storage maintenance every STORAGE_MAINTENANCE_INTERVAL_SECONDS on a background thread."""
+    if STORAGE_MAINTENANCE_INTERVAL_SECONDS <= 0:
+        return
+    storage_maintenance_stop.clear()
+
+    def worker():
+        while not storage_maintenance_stop.wait(STORAGE_MAINTENANCE_INTERVAL_SECONDS):
+            try:
+                run_storage_maintenance()
+            except TimeoutError:
+                logger.debug("Storage maintenance is running in another process")
+            except Exception as e:
+                logger.error(f"Storage maintenance failed: {str(e)}")
+
+    threading.Thread(target=worker, name="storage-maintenance", daemon=True).start()
+
+@app.post("/api/storage/maintenance")
+async def trigger_storage_maintenance():
+    try:
+        return await run_blocking(run_storage_maintenance)
+    except TimeoutError:
+        raise HTTPException(status_code=409, detail="Storage maintenance is already running")
+    except Exception as e:
+        logger.error(f"Storage maintenance failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Storage maintenance failed: {str(e)}")
+
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+EXPORT_DIR = os.path.abspath(os.environ.get("EXPORT_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports"))
+# The desktop app drops a copy of each export on the user's Desktop; headless runs turn it off
+EXPORT_DESKTOP_COPY = os.environ.get("EXPORT_DESKTOP_COPY", "1") != "0"
+# Exports with more records than this run as background jobs polled by the client
+EXPORT_SYNC_MAX_RECORDS = int(os.environ.get("EXPORT_SYNC_MAX_RECORDS", 500))
+EXPORT_JOB_TTL_SECONDS = int(os.environ.get("EXPORT_JOB_TTL_SECONDS", 3600))
+# Minimum time between progress writes for a running export job
+EXPORT_PROGRESS_INTERVAL = 0.5
+EXPORT_FETCH_SIZE = 200
+# Word measures drawings in EMUs and page margins in twips
+EMUS_PER_CM = 360000
+EMUS_PER_TWIP = 635
+EXPORT_IMAGE_WIDTH = int(7.0 * EMUS_PER_CM)
+EXPORT_MARGIN = int(0.7 * EMUS_PER_CM)
+
+WORD_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"'
+)
+IMAGE_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+def xml_text(text: str) -> str:
+    return xml_escape(INVALID_XML_CHARS.sub("", text))
+
+class WordReportWriter:
+    """Writes a .docx report incrementally with bounded memory.
+
+    python-docx keeps the whole document tree and every image blob in memory
+    until save, so the body XML is streamed to a temporary file instead and
+    images are copied into the package straight from disk. Styles, theme and
+    settings come from python-docx's default template so headings render the
+    same as before.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._package = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._body = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self._images: List[tuple] = []
+        self._extensions = set()
+        self._next_drawing_id = 1
+
+    def _write(self, xml: str):
+        self._body.write(xml)
+
+    def _run(self, text: str) -> str:
+        parts = []
+        for i, line in enumerate(text.split("\n")):
+            if i:
+                parts.append("<w:br/>")
+            parts.append(f'<w:t xml:space="preserve">{xml_text(line)}</w:t>')
+        return f"<w:r>{''.join(parts)}</w:r>"
+
+    def heading(self, text: str, level: int):
+        style = "Title" if level == 0 else f"Heading{level}"
+        self._write(f'<w:p><w:pPr><w:pStyle w:val="{style}"/></w:pPr>{self._run(text)}</w:p>')
+
+    def paragraph(self, text: str):
+        self._write(f"<w:p>{self._run(text)}</w:p>")
+
+    def page_break(self):
+        self._write('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+    def _add_image(self, filepath: str, filename: str, encoding: Optional[str] = None) -> str:
+        from docx.image.image import Image as DocxImage
+
+        # Only the header is needed for dimensions; the pixels are copied by the zip writer
+        with timed_phase("export.docx_image"), open_blob(filepath, encoding) as source:
+            image = DocxImage.from_file(source)
+        width = EXPORT_IMAGE_WIDTH
+        height = int(width * image.px_height / image.px_width) if image.px_width else width
+        rel_id = f"rIdImg{len(self._images) + 1}"
+        target = f"media/image{len(self._images) + 1}.{image.ext}"
+        with open_blob(filepath, encoding) as source, self._package.open(f"word/{target}", "w") as part:
+            shutil.copyfileobj(source, part, DOWNLOAD_CHUNK_SIZE)
+        record_upload_io("read", os.path.getsize(filepath))
+        self._images.append((rel_id, target))
+        self._extensions.add((image.ext, image.content_type))
+        drawing_id = self._next_drawing_id
+        self._next_drawing_id += 1
+        name = xml_text(filename)
+        return (
+            '<w:r><w:drawing><wp:inline>'
+            f'<wp:extent cx="{width}" cy="{height}"/>'
+            f'<wp:docPr id="{drawing_id}" name="Picture {drawing_id}"/>'
+            '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+            '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:pic>'
+            f'<pic:nvPicPr><pic:cNvPr id="0" name="{name}"/><pic:cNvPicPr/></pic:nvPicPr>'
+            f'<pic:blipFill><a:blip r:embed="{rel_id}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+            f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{width}" cy="{height}"/></a:xfrm><a:prstGeom prst="rect"/></pic:spPr>'
+            '</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>'
+        )
+
+    def image_row(self, images: List[tuple], record_label: str):
+        """Add up to two (filepath, filename, encoding) images side by side in a borderless table row."""
+        column_width = 4320
+        cells = []
+        for filepath, filename, encoding in images:
+            try:
+                content = self._add_image(filepath, filename, encoding)
+                logger.debug(f"Added image {filename} to Word document for {record_label}")
+            except Exception as e:
+                logger.warning(f"Failed to add image {filename} for {record_label}: {str(e)}")
+                content = self._run(f"Failed to load image: {filename}")
+            cells.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column_width}"/></w:tcPr><w:p>{content}</w:p></w:tc>')
+        while len(cells) < 2:
+            cells.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column_width}"/></w:tcPr><w:p/></w:tc>')
+        self._write(
+            '<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/>'
+            '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+            f'</w:tblPr><w:tblGrid><w:gridCol w:w="{column_width}"/><w:gridCol w:w="{column_width}"/></w:tblGrid>'
+            f"<w:tr>{''.join(cells)}</w:tr></w:tbl>"
+        )
+
+    def close(self):
+        margin = round(EXPORT_MARGIN / EMUS_PER_TWIP)
+        self._write(
+            '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+            f'<w:pgMar w:top="{margin}" w:right="{margin}" w:bottom="{margin}" w:left="{margin}" w:header="720" w:footer="720" w:gutter="0"/>'
+            '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/></w:sectPr></w:body></w:document>'
+        )
+        self._body.seek(0)
+        with self._package.open("word/document.xml", "w") as part:
+            part.write(f"<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n<w:document {WORD_NAMESPACES}><w:body>".encode("utf-8"))
+            while True:
+                chunk = self._body.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                part.write(chunk.encode("utf-8"))
+        self._body.close()
+
+        import docx
+
+        template_path = os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx")
+        with zipfile.ZipFile(template_path) as template:
+            for item in template.infolist():
+                if item.filename == "word/document.xml":
+                    continue
+                data = template.read(item.filename)
+                if item.filename == "word/_rels/document.xml.rels":
+                    relationships = "".join(
+                        f'<Relationship Id="{rel_id}" Type="{IMAGE_RELATIONSHIP}" Target="{target}"/>'
+                        for rel_id, target in self._images
+                    )
+                    data = data.replace(b"</Relationships>", f"{relationships}</Relationships>".encode("utf-8"))
+                elif item.filename == "[Content_Types].xml":
+                    defaults = "".join(
+                        f'<Default Extension="{ext}" ContentType="{content_type}"/>'
+                        for ext, content_type in sorted(self._extensions)
+                        if f'Extension="{ext}"'.encode("utf-8") not in data
+                    )
+                    data = data.replace(b"<Override ", f"{defaults}<Override ".encode("utf-8"), 1)
+                self._package.writestr(item, data)
+        self._package.close()
+
+    def abort(self):
+        self._body.close()
+        self._package.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def iter_export_records(filters: dict):
+    """Yield the selected errors with their files, one keyset page of errors per joined query.
+
+    No connection is held between pages, so image decoding and document writing in the
+    caller never keep a pooled connection busy.
+    """
+    conditions, params = error_filter_conditions(filters, alias="e")
+    after = None
+    while True:
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if after:
+            page_conditions.append("(e.created_at, e.id) > (?, ?)")
+            page_params.extend(after)
+        where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+        with db_connection() as conn:
+            # One row past the page tells whether another page follows, without an extra query
+            rows = conn.execute(f"""
+                SELECT e.id, e.title, e.description, e.severity, e.category, e.tags, e.solution, e.status,
+                       e.created_at, e.updated_at, f.id, f.filename, f.filepath, f.size, f.mimetype, f.encoding
+                FROM (SELECT * FROM errors e {where} ORDER BY e.created_at, e.id LIMIT ?) e
+                LEFT JOIN files f ON f.error_id = e.id
+                ORDER BY e.created_at, e.id
+            """, (*page_params, EXPORT_FETCH_SIZE + 1)).fetchall()
+        records = []
+        for row in rows:
+            if not records or records[-1]["id"] != row[0]:
+                records.append(row_to_error(row[:10]))
+                records[-1]["files"] = []
+            if row[10] is not None:
+                records[-1]["files"].append(row_to_file(row[10:]))
+        has_more = len(records) > EXPORT_FETCH_SIZE
+        yield from records[:EXPORT_FETCH_SIZE]
+        if not has_more:
+            break
+        last = records[EXPORT_FETCH_SIZE - 1]
+        after = (last["created_at"], last["id"])
+
+def format_timestamp(value: Optional[str]) -> str:
+    return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S') if value else 'N/A'
+
+def write_word_export(output_path: str, filters: dict, progress=None) -> int:
+    """Render the selected errors into a .docx at output_path and return the number of records written."""
+    writer = WordReportWriter(output_path)
+    try:
+        with db_connection() as conn:
+            total = export_selection(conn, filters)[0]
+        if progress:
+            progress(0, total)
+        writer.heading('Error Log Report', 0)
+
+        idx = 0
+        for idx, error in enumerate(iter_export_records(filters), 1):
+            record_label = f"Record {idx}"
+            if idx > 1:
+                writer.page_break()
+            writer.heading(f'Record {idx}', 1)
+            writer.paragraph(f"Title: {error['title'] or 'N/A'}")
+            writer.paragraph(f"Description: {error['description'] or 'N/A'}")
+            writer.paragraph(f"Severity Fleischman: {error['severity'] or 'N/A'}")
+            writer.paragraph(f"Category: {error['category'] or 'N/A'}")
+            writer.paragraph(f"Tags: {', '.join(error['tags']) or 'None'}")
+            writer.paragraph(f"Solution: {error['solution'] or 'N/A'}")
+            writer.paragraph(f"Status: {error['status'] or 'N/A'}")
+            writer.paragraph(f"Created At: {format_timestamp(error['created_at'])}")
+            writer.paragraph(f"Updated At: {format_timestamp(error['updated_at'])}")
+            writer.paragraph(f"Files: {', '.join(file['filename'] for file in error['files']) or 'None'}")
 
             # Add images for this error immediately after the record
             if error["files"]:
-                doc.add_heading(f'Images for Record {idx}: {error["title"]}', level=2)
-                
+                writer.heading(f'Images for Record {idx}: {error["title"]}', 2)
                 image_files = []
-                for file in error["files"]:
-                    if file["content"] and file["mimetype"].startswith("image/"):
-                        try:
-                            image_data = base64.b64decode(file["content"])
-                            image_stream = BytesIO(image_data)
-                            image_files.append((image_stream, file["filename"]))
-                        except Exception as e:
-                            logger.warning(f"Failed to decode image {file['filename']} for Record {idx}: {str(e)}")
-                            doc.add_paragraph(f'Failed to load image: {file["filename"]}')
-
-                # Add images in pairs (side by side)
-                for i in range(0, len(image_files), 2):
-                    row_cells = doc.add_table(rows=1, cols=2).rows[0].cells
-                    for j in range(2):
-                        if i + j < len(image_files):
-                            image_stream, filename = image_files[i + j]
-                            try:
-                                row_cells[j].paragraphs[0].add_run().add_picture(image_stream, width=Cm(7.0))
-                                logger.debug(f"Added image {filename} to Word document for Record {idx}")
-                            except Exception as e:
-                                logger.warning(f"Failed to add image {filename} for Record {idx}: {str(e)}")
-                                row_cells[j].text = f"Failed to load image: {filename}"
-
-            # Add page break after each record, except for the last one
-            if idx < len(errors):
-                doc.add_page_break()
-
-        # Save document to BytesIO
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        docx_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        logger.info("Word document generated successfully")
-        
-                # Define the output directory and filename
-        desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-        output_dir = os.path.join(desktop_path, "Error Log Report")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        filename = f"Error_Log_Export_{datetime.now().strftime('%Y-%m-%d')}.docx"
-        file_path = os.path.join(output_dir, filename)
-
-        # Save the document to the specified path
-        doc.save(file_path)
-        logger.info(f"Word document saved to: {file_path}")
-
-        return JSONResponse(
-            content={
-                "filename": f"Error_Log_Export_{datetime.now().strftime('%Y-%m-%d')}.docx",
-                "content": docx_base64,
-                "mimetype": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            }
-        )
+                with timed_phase("export.images"):
+                    for file in error["files"]:
+                        if file["mimetype"].startswith("image/"):
+                            if os.path.exists(file["filepath"]):
+                                rendition = ensure_rendition(file["filepath"], file["mimetype"], "export", file["encoding"])
+                                if rendition:
+                                    image_files.append((rendition[0], file["filename"], None))
+                                else:
+                                    image_files.append((file["filepath"], file["filename"], file["encoding"]))
+                            else:
+                                logger.warning(f"Image {file['filename']} for {record_label} is missing on disk")
+                                writer.paragraph(f'Failed to load image: {file["filename"]}')
+                    # Add images in pairs (side by side)
+                    for i in range(0, len(image_files), 2):
+                        writer.image_row(image_files[i:i + 2], record_label)
+
+            if progress:
+                progress(idx, total)
+        with timed_phase("export.package"):
+            writer.close()
+    except Exception:
+        writer.abort()
+        raise
+    logger.info(f"Word document with {idx} records written to: {output_path}")
+    return idx
+
+def export_filename() -> str:
+    return f"Error_Log_Export_{datetime.now().strftime('%Y-%m-%d')}.docx"
+
+def copy_export_to_desktop(path: str, filename: str):
+    if not EXPORT_DESKTOP_COPY:
+        return
+    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
+    output_dir = os.path.join(desktop_path, "Error Log Report")
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, filename)
+    shutil.copyfile(path, file_path)
+    logger.info(f"Word document saved to: {file_path}")
+
+def remove_file_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.warning(f"Failed to remove temporary file {path}: {str(e)}")
+
+# Export cache: finished documents are stored under a key derived from the filters
+# and the state of the selected rows, so unchanged exports are served from disk.
+EXPORT_CACHE_DIR = os.path.join(EXPORT_DIR, "cache")
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get("EXPORT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+EXPORT_CACHE_MAX_AGE_SECONDS = int(os.environ.get("EXPORT_CACHE_MAX_AGE_SECONDS", 7 * 24 * 3600))
+EXPORT_FORMAT_VERSION = 2
+export_cache_lock = threading.Lock()
+
+def export_selection(conn: sqlite3.Connection, filters: dict) -> tuple:
+    """Return (row count, latest updated_at) for the errors an export with these filters selects."""
+    conditions, params = error_filter_conditions(filters)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return conn.execute(f"SELECT COUNT(*), MAX(updated_at) FROM errors {where}", params).fetchone()
+
+def export_cache_key(filters: dict, count: int, latest_update: Optional[str]) -> str:
+    # The row count is part of the key so deleted records invalidate the entry too
+    fingerprint = json.dumps(
+        {
+            "version": EXPORT_FORMAT_VERSION,
+            "filters": {key: value for key, value in sorted(filters.items()) if value},
+            "count": count,
+            "latest_update": latest_update,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+def export_cache_path(key: str) -> str:
+    return os.path.join(EXPORT_CACHE_DIR, f"{key}.docx")
+
+def evict_export_cache():
+    """Drop cache entries older than the age limit, then the least recently used ones above the size limit."""
+    with export_cache_lock:
+        try:
+            entries = [entry for entry in os.scandir(EXPORT_CACHE_DIR) if entry.name.endswith(".docx")]
+        except FileNotFoundError:
+            return
+        now = time.time()
+        live = []
+        for entry in entries:
+            stat_result = entry.stat()
+            if now - stat_result.st_mtime > EXPORT_CACHE_MAX_AGE_SECONDS:
+                remove_file_quietly(entry.path)
+                logger.debug(f"Evicted expired export cache entry: {entry.name}")
+            else:
+                live.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+        total = sum(size for _, size, _ in live)
+        for _, size, path in sorted(live):
+            if total <= EXPORT_CACHE_MAX_BYTES:
+                break
+            remove_file_quietly(path)
+            total -= size
+            logger.debug(f"Evicted export cache entry over size limit: {path}")
+
+def lookup_export(filters: dict) -> dict:
+    """Resolve the cache entry for an export, reporting whether it already exists."""
+    with db_connection() as conn:
+        count, latest_update = export_selection(conn, filters)
+    key = export_cache_key(filters, count, latest_update)
+    path = export_cache_path(key)
+    cached = os.path.exists(path)
+    if cached:
+        # Refresh the timestamp so size-based eviction treats it as recently used
+        os.utime(path)
+        logger.info(f"Serving Word export from cache: {key}")
+    return {"key": key, "path": path, "count": count, "cached": cached}
+
+def render_export(filters: dict, path: str, progress=None):
+    """Render an export into its cache path atomically and copy it to the Desktop folder."""
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+    partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+    with timed_phase("export.render"):
+        write_word_export(partial_path, filters, progress)
+    os.replace(partial_path, path)
+    evict_export_cache()
+
+def build_word_export(filters: dict) -> str:
+    """Return the path of an up-to-date export for these filters, rendering it on a cache miss."""
+    try:
+        with timed_phase("export.cache_lookup"):
+            export = lookup_export(filters)
+        if not export["cached"]:
+            render_export(filters, export["path"])
+        with timed_phase("export.desktop_copy"):
+            copy_export_to_desktop(export["path"], export_filename())
+        return export["path"]
     except Exception as e:
         logger.error(f"Failed to generate Word document: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate Word document: {str(e)}")
 
+# Background export jobs, tracked in the database so every worker can report on them
+EXPORT_JOB_COLUMNS = "id, status, processed, total, filename, filters, path, error, finished_at"
+
+def expire_export_jobs():
+    with db_connection() as conn:
+        conn.execute(
+            "DELETE FROM export_jobs WHERE finished_at < ?",
+            (time.time() - EXPORT_JOB_TTL_SECONDS,)
+        )
+
+def update_export_job(job_id: str, **fields):
+    assignments = ", ".join(f"{column} = ?" for column in fields)
+    with db_connection() as conn:
+        conn.execute(f"UPDATE export_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+def fetch_export_job(job_id: str) -> dict:
+    with db_connection() as conn:
+        row = conn.execute(f"SELECT {EXPORT_JOB_COLUMNS} FROM export_jobs WHERE id = ?", (job_id,)).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    job = dict(zip(EXPORT_JOB_COLUMNS.split(", "), row))
+    job["filters"] = json.loads(job["filters"])
+    return job
+
+def run_export_job(job_id: str):
+    job = fetch_export_job(job_id)
+    last_write = 0.0
+
+    def progress(done: int, total: int):
+        nonlocal last_write
+        now = time.monotonic()
+        if now - last_write >= EXPORT_PROGRESS_INTERVAL or done == total:
+            last_write = now
+            update_export_job(job_id, status="running", processed=done, total=total)
+
+    try:
+        render_export(job["filters"], job["path"], progress)
+        copy_export_to_desktop(job["path"], job["filename"])
+        update_export_job(job_id, status="completed", finished_at=time.time())
+    except Exception as e:
+        logger.error(f"Export job {job_id} failed: {str(e)}")
+        update_export_job(job_id, status="failed", error=str(e), finished_at=time.time())
+
+def start_export_job(filters: dict, export: dict) -> dict:
+    expire_export_jobs()
+    job_id = str(uuid.uuid4())
+    with db_connection() as conn:
+        conn.execute(
+            f"INSERT INTO export_jobs ({EXPORT_JOB_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                "completed" if export["cached"] else "queued",
+                export["count"] if export["cached"] else 0,
+                export["count"],
+                export_filename(),
+                json.dumps(filters),
+                export["path"],
+                None,
+                time.time() if export["cached"] else None,
+            )
+        )
+    if export["cached"]:
+        logger.info(f"Word export job {job_id} satisfied from cache")
+    else:
+        get_export_executor().submit(run_export_job, job_id)
+        logger.info(f"Started Word export job {job_id}")
+    return export_job_status(job_id)
+
+def export_job_status(job_id: str) -> dict:
+    job = fetch_export_job(job_id)
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "processed": job["processed"],
+        "total": job["total"],
+        "filename": job["filename"],
+        "error": job["error"],
+        "status_url": f"/api/export/word/jobs/{job['id']}",
+        "download_url": f"/api/export/word/jobs/{job['id']}/download",
+    }
+
+def export_filters(
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    updated_since: Optional[str] = None,
+) -> dict:
+    """Query parameters selecting the records to export; dates are ISO 8601 and created_to is exclusive."""
+    for value in (created_from, created_to, updated_since):
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    return {
+        "severity": severity,
+        "status": status,
+        "category": category,
+        "tag": tag,
+        "created_from": created_from,
+        "created_to": created_to,
+        "updated_since": updated_since,
+    }
+
+@app.get("/api/export/word")
+async def export_to_word(filters: dict = Depends(export_filters)):
+    export = await run_blocking(lookup_export, filters)
+    # Small or cached exports stream back directly; large ones become a background job to poll
+    if not export["cached"] and export["count"] > EXPORT_SYNC_MAX_RECORDS:
+        return JSONResponse(status_code=202, content=await run_blocking(start_export_job, filters, export))
+    path = await run_in(get_export_executor(), build_word_export, filters)
+    return FileResponse(path, media_type=DOCX_MIMETYPE, filename=export_filename())
+
+@app.post("/api/export/word/jobs", status_code=202)
+async def create_export_job(filters: dict = Depends(export_filters)):
+    export = await run_blocking(lookup_export, filters)
+    return await run_blocking(start_export_job, filters, export)
+
+@app.get("/api/export/word/jobs/{job_id}")
+async def get_export_job(job_id: str):
+    return await run_blocking(export_job_status, job_id)
+
+@app.get("/api/export/word/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    job = await run_blocking(fetch_export_job, job_id)
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}")
+    path, filename = job["path"], job["filename"]
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export has been evicted from the cache; start a new export")
+    return FileResponse(path, media_type=DOCX_MIMETYPE, filename=filename)
+
 if __name__ == "__main__":
+    import signal
     import threading
-    
+    import uvicorn
+    import webview
+
     serve_process = None
     if os.path.exists("dist"):
         # Use a more reliable way to serve static files
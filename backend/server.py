@@ -0,0 +1,142 @@
+"""Headless entry point: the API and the built frontend from one multi-worker ASGI app.
+
+Unlike the desktop launcher in main.py there is no window and no separate static
+server. The API and `dist` are served from the same port by several uvicorn
+worker processes sharing one SQLite database and upload directory.
+
+    python server.py --workers 4 --port 8768 --db-file /srv/logfix/errors.db --upload-dir /srv/logfix/uploads
+
+Every option can also be set through the environment (LOGFIX_HOST, LOGFIX_PORT,
+LOGFIX_WORKERS, DB_FILE, UPLOAD_DIR, EXPORT_DIR, DIST_DIR). Behind another ASGI
+server, use the factory: `uvicorn --factory server:create_app --workers 4`.
+"""
+import argparse
+import gzip
+import os
+import threading
+
+import anyio
+import uvicorn
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+# Headless runs have no user Desktop to drop export copies on
+os.environ.setdefault("EXPORT_DESKTOP_COPY", "0")
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIST_DIRS = (os.path.join(BACKEND_DIR, "dist"), os.path.join(os.path.dirname(BACKEND_DIR), "dist"))
+DIST_DIR = os.environ.get("DIST_DIR") or next((path for path in DEFAULT_DIST_DIRS if os.path.isdir(path)), DEFAULT_DIST_DIRS[0])
+
+# Vite fingerprints everything under assets/, so those files never change under the same URL
+IMMUTABLE_PREFIX = "assets" + os.sep
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+class FrontendFiles(StaticFiles):
+    """Serves the built frontend with cache headers and gzip, falling back to index.html for client routes.
+
+    Compressed bodies are built once per file version and kept in memory; `dist`
+    is small and does not change while the server runs.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__(directory=directory, html=True)
+        self._gzipped: dict = {}
+        self._gzipped_lock = threading.Lock()
+
+    async def get_response(self, path: str, scope) -> Response:
+        try:
+            response = await super().get_response(path, scope)
+        except HTTPException as exc:
+            # Paths without an extension belong to the React router; unknown API paths stay 404
+            if exc.status_code != 404 or path.split(os.sep)[0] == "api" or os.path.splitext(path)[1]:
+                raise
+            response = await super().get_response("index.html", scope)
+
+        if isinstance(response, FileResponse) and response.status_code == 200 and self.should_compress(response, scope):
+            body = await anyio.to_thread.run_sync(self.gzipped_body, response.path, response.stat_result)
+            headers = {key: value for key, value in response.headers.items() if key not in ("content-length", "accept-ranges")}
+            headers["content-encoding"] = "gzip"
+            # The compressed body is a different representation of the same file
+            headers["etag"] = f"W/{response.headers['etag']}"
+            return Response(body, status_code=200, headers=headers)
+        return response
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        relative = os.path.relpath(full_path, self.directory)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if relative.startswith(IMMUTABLE_PREFIX) else REVALIDATE_CACHE_CONTROL
+        if is_compressible(response.media_type or response.headers.get("content-type", "")):
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def should_compress(self, response: FileResponse, scope) -> bool:
+        accept_encoding = dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1")
+        return (
+            "gzip" in accept_encoding
+            and response.stat_result.st_size >= GZIP_MIN_BYTES
+            and is_compressible(response.media_type or "")
+        )
+
+    def gzipped_body(self, path: str, stat_result: os.stat_result) -> bytes:
+        key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+        with self._gzipped_lock:
+            body = self._gzipped.get(key)
+        if body is None:
+            with open(path, "rb") as f:
+                body = gzip.compress(f.read(), compresslevel=GZIP_LEVEL, mtime=0)
+            with self._gzipped_lock:
+                self._gzipped[key] = body
+        return body
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+def create_app():
+    """Return the API app with `dist` mounted behind the API routes."""
+    # Imported here because main reads DB_FILE, UPLOAD_DIR and EXPORT_DIR from the environment at import time
+    import main
+
+    dist_dir = os.environ.get("DIST_DIR") or DIST_DIR
+    if os.path.isfile(os.path.join(dist_dir, "index.html")):
+        # Mounted last, so API routes always match first
+        main.app.mount("/", FrontendFiles(dist_dir), name="frontend")
+        main.logger.info(f"Serving frontend from {dist_dir}")
+    else:
+        main.logger.warning(f"No built frontend at {dist_dir}; serving the API only")
+    return main.app
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Error Log System API and frontend without a desktop window.")
+    parser.add_argument("--host", default=os.environ.get("LOGFIX_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("LOGFIX_PORT", 8768)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("LOGFIX_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--db-file", default=os.environ.get("DB_FILE"), help="SQLite database path")
+    parser.add_argument("--upload-dir", default=os.environ.get("UPLOAD_DIR"), help="Attachment storage directory")
+    parser.add_argument("--export-dir", default=os.environ.get("EXPORT_DIR"), help="Word export cache directory")
+    parser.add_argument("--dist", default=DIST_DIR, help="Built frontend to serve")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Workers are fresh processes that import this module again, so settings travel through the environment
+    for name, value in (
+        ("DB_FILE", args.db_file),
+        ("UPLOAD_DIR", args.upload_dir),
+        ("EXPORT_DIR", args.export_dir),
+        ("DIST_DIR", args.dist),
+    ):
+        if value:
+            os.environ[name] = os.path.abspath(value)
+    uvicorn.run(
+        "server:create_app",
+        factory=True,
+        app_dir=BACKEND_DIR,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
@@ -1,10 +1,11 @@
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { ErrorEntry } from "@/types/error";
 import { FileText, Image, File, ArrowLeft, X } from "lucide-react";
 import { useToast } from "@/hooks/use-toast";
+import { API_BASE_URL } from "@/utils/api";
 
 interface ErrorDetailsProps {
   error: ErrorEntry;
@@ -20,58 +21,22 @@ const getFileIcon = (type: string) => {
 
 export function ErrorDetails({ error, onEdit, onClose }: ErrorDetailsProps) {
   const { toast } = useToast();
-  const [imageUrls, setImageUrls] = useState<{ [fileId: string]: string }>({});
   const [selectedImage, setSelectedImage] = useState<string | null>(null);
 
-  // Fetch image content for image files
-  useEffect(() => {
-    const fetchImages = async () => {
-      const imageFiles = error.files.filter((file) => file.mimetype.startsWith("image/"));
-      const urls: { [fileId: string]: string } = {};
+  // Attachments are streamed straight from the binary download route
+  const fileUrl = (fileId: string, inline = false) =>
+    `${API_BASE_URL}/api/files/${fileId}/download${inline ? "?inline=true" : ""}`;
+  const thumbnailUrl = (fileId: string) => `${API_BASE_URL}/api/files/${fileId}/thumbnail`;
 
-      for (const file of imageFiles) {
-        try {
-          const response = await fetch(`http://localhost:8768/api/files/${file.id}`);
-          if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-          const data = await response.json();
-          urls[file.id] = `data:${data.mimetype};base64,${data.content}`;
-        } catch (error: any) {
-          toast({
-            title: "Error",
-            description: `Failed to load image ${file.filename}: ${error.message}`,
-            variant: "destructive",
-          });
-        }
-      }
-
-      setImageUrls(urls);
-    };
-
-    if (error.files.some((file) => file.mimetype.startsWith("image/"))) {
-      fetchImages();
-    }
-  }, [error.files, toast]);
-
-  const handleDownload = async (fileId: string, filename: string, mimetype: string) => {
+  const handleDownload = (fileId: string, filename: string) => {
     try {
-      const response = await fetch(`http://localhost:8768/api/files/${fileId}`);
-      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-      const data = await response.json();
-      const binaryString = atob(data.content);
-      const bytes = new Uint8Array(binaryString.length);
-      for (let i = 0; i < binaryString.length; i++) {
-        bytes[i] = binaryString.charCodeAt(i);
-      }
-      const blob = new Blob([bytes], { type: mimetype });
-      const url = window.URL.createObjectURL(blob);
       const link = document.createElement("a");
-      link.href = url;
+      link.href = fileUrl(fileId);
       link.download = filename;
       link.click();
-      window.URL.revokeObjectURL(url);
       toast({
         title: "Success",
-        description: `File ${filename} downloaded successfully.`,
+        description: `File ${filename} download started.`,
       });
     } catch (error: any) {
       toast({
@@ -168,19 +133,20 @@ export function ErrorDetails({ error, onEdit, onClose }: ErrorDetailsProps) {
                             <Button
                               variant="outline"
                               size="sm"
-                              onClick={() => handleDownload(file.id, file.filename, file.mimetype)}
+                              onClick={() => handleDownload(file.id, file.filename)}
                             >
                               Download
                             </Button>
                           )}
                         </div>
-                        {isImage && imageUrls[file.id] && (
+                        {isImage && (
                           <img
-                            src={imageUrls[file.id]}
+                            src={thumbnailUrl(file.id)}
                             alt={file.filename}
+                            loading="lazy"
                             className="max-w-full h-auto rounded-md mt-2 cursor-pointer"
                             style={{ maxWidth: "300px" }}
-                            onClick={() => openImageModal(imageUrls[file.id])}
+                            onClick={() => openImageModal(fileUrl(file.id, true))}
                           />
                         )}
                       </div>
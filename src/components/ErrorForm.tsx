@@ -10,6 +10,7 @@ import { ErrorEntry } from "@/types/error";
 import { Upload, X, FileText, Image, File } from "lucide-react";
 import { useToast } from "@/hooks/use-toast";
 import axios from "axios";
+import { API_BASE_URL } from "@/utils/api";
 
 interface ErrorFormProps {
   error?: ErrorEntry;
@@ -17,10 +18,10 @@ interface ErrorFormProps {
   onCancel: () => void;
 }
 
-const API_BASE_URL = "http://localhost:8768";
-const MAX_FILE_SIZE = 5 * 1024 * 1024; // 5MB
+// Matches the backend's default MAX_FILE_BYTES; files above CHUNKED_UPLOAD_THRESHOLD upload in resumable chunks
+const MAX_FILE_SIZE = 1024 * 1024 * 1024; // 1GB
 const MAX_IMAGES = 4;
-const ALLOWED_FILE_TYPES = ["image/jpeg", "image/png", "image/gif"];
+const IMAGE_FILE_TYPES = ["image/jpeg", "image/png", "image/gif"];
 
 export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
   const { toast } = useToast();
@@ -61,18 +62,18 @@ export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
 
   const handleFileUpload = (event: React.ChangeEvent<HTMLInputElement>) => {
     const uploadedFiles = Array.from(event.target.files || []);
-    const currentImageCount = (error?.files?.filter((file) => ALLOWED_FILE_TYPES.includes(file.mimetype || "application/octet-stream")).length || 0) + files.filter((file) => ALLOWED_FILE_TYPES.includes(file.type)).length;
+    let imageCount = (error?.files?.filter((file) => IMAGE_FILE_TYPES.includes(file.mimetype || "application/octet-stream")).length || 0) + files.filter((file) => IMAGE_FILE_TYPES.includes(file.type)).length;
     const validFiles: File[] = [];
     const invalidFiles: string[] = [];
 
     uploadedFiles.forEach((file) => {
-      if (!ALLOWED_FILE_TYPES.includes(file.type)) {
-        invalidFiles.push(`${file.name} (only JPEG, PNG, or GIF images are allowed)`);
-      } else if (file.size > MAX_FILE_SIZE) {
-        invalidFiles.push(`${file.name} (file size exceeds 5MB)`);
-      } else if (currentImageCount + validFiles.length >= MAX_IMAGES) {
+      const isImage = IMAGE_FILE_TYPES.includes(file.type);
+      if (file.size > MAX_FILE_SIZE) {
+        invalidFiles.push(`${file.name} (file size exceeds 1GB)`);
+      } else if (isImage && imageCount >= MAX_IMAGES) {
         invalidFiles.push(`${file.name} (maximum 4 images allowed)`);
       } else {
+        if (isImage) imageCount++;
         validFiles.push(file);
       }
     });
@@ -80,8 +81,8 @@ export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
     if (validFiles.length > 0) {
       setFiles((prev) => [...prev, ...validFiles]);
       toast({
-        title: "Images uploaded",
-        description: `${validFiles.length} image(s) added successfully.`,
+        title: "Files added",
+        description: `${validFiles.length} file(s) added successfully.`,
       });
     }
 
@@ -96,7 +97,7 @@ export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
     if (uploadedFiles.length === 0) {
       toast({
         title: "No files selected",
-        description: "Please select at least one image to upload.",
+        description: "Please select at least one file to upload.",
         variant: "destructive",
       });
     }
@@ -109,8 +110,8 @@ export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
   const removeFile = (index: number) => {
     setFiles((prev) => prev.filter((_, i) => i !== index));
     toast({
-      title: "Image removed",
-      description: "The image has been removed from the upload list.",
+      title: "File removed",
+      description: "The file has been removed from the upload list.",
     });
   };
 
@@ -303,29 +304,28 @@ export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
         </div>
 
         <div className="space-y-2">
-          <Label>Image Attachments (Up to 4)</Label>
+          <Label>Attachments</Label>
           <div className="border-2 border-dashed border-border rounded-lg p-6 text-center hover:border-primary/20 transition-colors">
             <Upload className="h-8 w-8 mx-auto mb-2 text-muted-foreground" />
             <div className="space-y-2">
               <p className="text-sm text-muted-foreground">
-                Upload up to 4 images (JPEG, PNG, GIF; max 5MB each)
+                Upload logs, stack dumps and other files, plus up to 4 images (max 1GB each)
               </p>
               <input
                 type="file"
                 multiple
                 onChange={handleFileUpload}
                 className="hidden"
-                accept={ALLOWED_FILE_TYPES.join(",")}
                 ref={fileInputRef}
               />
               <Button type="button" variant="outline" size="sm" onClick={triggerFileInput}>
-                Choose Images
+                Choose Files
               </Button>
             </div>
           </div>
           {files.length > 0 && (
             <div className="space-y-2">
-              <p className="text-sm font-medium">New Image Attachments</p>
+              <p className="text-sm font-medium">New Attachments</p>
               {files.map((file, index) => {
                 const Icon = getFileIcon(file.type);
                 return (
@@ -350,7 +350,7 @@ export function ErrorForm({ error, onSave, onCancel }: ErrorFormProps) {
           )}
           {error?.files?.length > 0 && (
             <div className="space-y-2">
-              <p className="text-sm font-medium">Existing Image Attachments</p>
+              <p className="text-sm font-medium">Existing Attachments</p>
               {error.files.map((file, index) => {
                 const Icon = getFileIcon(file.mimetype || "application/octet-stream");
                 return (
@@ -1,12 +1,14 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback, useRef } from "react";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { ErrorCard } from "@/components/ErrorCard";
 import { ErrorForm } from "@/components/ErrorForm";
 import { ErrorDetails } from "@/components/ErrorDetails";
-import { ErrorEntry } from "@/types/error";
+import { ErrorChange, ErrorEntry, ErrorPage, ErrorStats, SimilarError } from "@/types/error";
 import { exportToWord } from "@/utils/word";
+import { CHUNKED_UPLOAD_THRESHOLD, uploadFileChunked } from "@/utils/upload";
+import { API_BASE_URL } from "@/utils/api";
 import { Plus, Search, Download, Bug } from "lucide-react";
 import { useToast } from "@/hooks/use-toast";
 
@@ -33,6 +35,9 @@ interface ToastAction {
   update: (props: ToasterToast) => void;
 }
 
+const PAGE_SIZE = 50;
+const CHANGE_EVENTS = ["created", "updated", "file_attached", "deleted", "removed"];
+
 const Index = () => {
   const { toast } = useToast() as { toast: (props: Toast) => ToastAction };
   const [errors, setErrors] = useState<ErrorEntry[]>([]);
@@ -43,14 +48,36 @@ const Index = () => {
   const [severityFilter, setSeverityFilter] = useState<string>("all");
   const [statusFilter, setStatusFilter] = useState<string>("all");
 
-  // Fetch errors from backend on component mount
-  useEffect(() => {
-    const fetchErrors = async () => {
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [hasMore, setHasMore] = useState(false);
+  const [stats, setStats] = useState<ErrorStats | null>(null);
+
+  // Build the list query; filtering and pagination happen server-side
+  const buildErrorsUrl = useCallback(
+    (cursor?: string | null) => {
+      const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+      if (severityFilter !== "all") params.set("severity", severityFilter);
+      if (statusFilter !== "all") params.set("status", statusFilter);
+      if (cursor) params.set("cursor", cursor);
+      // Free-text queries go through the ranked full-text search endpoint
+      if (/\w/.test(searchTerm)) {
+        params.set("q", searchTerm.trim());
+        return `${API_BASE_URL}/api/errors/search?${params.toString()}`;
+      }
+      return `${API_BASE_URL}/api/errors?${params.toString()}`;
+    },
+    [severityFilter, statusFilter, searchTerm]
+  );
+
+  const fetchErrors = useCallback(
+    async (cursor?: string | null) => {
       try {
-        const response = await fetch("http://localhost:8768/api/errors");
+        const response = await fetch(buildErrorsUrl(cursor));
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-        const data = await response.json();
-        setErrors(data);
+        const data: ErrorPage = await response.json();
+        setErrors((prev) => (cursor ? [...prev, ...data.items] : data.items));
+        setNextCursor(data.next_cursor);
+        setHasMore(data.has_more);
       } catch (error: any) {
         toast({
           title: "Error",
@@ -58,9 +85,61 @@ const Index = () => {
           variant: "destructive",
         });
       }
+    },
+    [buildErrorsUrl, toast]
+  );
+
+  // Dashboard counts come from the server so they cover every error, not just the loaded pages
+  const fetchStats = useCallback(async () => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/stats`);
+      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+      setStats(await response.json());
+    } catch (error: any) {
+      console.error("Failed to fetch stats:", error);
+    }
+  }, []);
+
+  useEffect(() => {
+    fetchStats();
+  }, [fetchStats]);
+
+  // Search results are ranked server-side, so live changes only refresh entries already shown
+  const searchingRef = useRef(false);
+  searchingRef.current = /\w/.test(searchTerm);
+
+  // Apply pushed changes from other users instead of polling the list
+  useEffect(() => {
+    const params = new URLSearchParams();
+    if (severityFilter !== "all") params.set("severity", severityFilter);
+    if (statusFilter !== "all") params.set("status", statusFilter);
+    const source = new EventSource(`${API_BASE_URL}/api/events?${params.toString()}`);
+    let statsTimeout: ReturnType<typeof setTimeout> | undefined;
+
+    const applyChange = (event: MessageEvent) => {
+      const change: ErrorChange = JSON.parse(event.data);
+      setErrors((prev) => {
+        if (!change.error) return prev.filter((e) => e.id !== change.id);
+        const index = prev.findIndex((e) => e.id === change.id);
+        if (index >= 0) return prev.map((e) => (e.id === change.id ? change.error! : e));
+        return searchingRef.current ? prev : [change.error, ...prev];
+      });
+      clearTimeout(statsTimeout);
+      statsTimeout = setTimeout(fetchStats, 500);
+    };
+
+    CHANGE_EVENTS.forEach((type) => source.addEventListener(type, applyChange));
+    return () => {
+      clearTimeout(statsTimeout);
+      source.close();
     };
-    fetchErrors();
-  }, [toast]);
+  }, [severityFilter, statusFilter, fetchStats]);
+
+  // Refetch the first page whenever the filters change
+  useEffect(() => {
+    const timeout = setTimeout(() => fetchErrors(), 250);
+    return () => clearTimeout(timeout);
+  }, [fetchErrors]);
 
   const handleSaveError = async (
     errorData: Omit<ErrorEntry, "id" | "created_at" | "updated_at" | "files">,
@@ -75,11 +154,15 @@ const Index = () => {
       formData.append("tags", JSON.stringify(errorData.tags));
       formData.append("solution", errorData.solution || "");
       formData.append("status", errorData.status);
-      files.forEach((file) => formData.append("files", file));
+      // Large files go through the resumable upload API after the error is saved
+      const largeFiles = files.filter((file) => file.size > CHUNKED_UPLOAD_THRESHOLD);
+      files
+        .filter((file) => file.size <= CHUNKED_UPLOAD_THRESHOLD)
+        .forEach((file) => formData.append("files", file));
 
       const url = editingError
-        ? `http://localhost:8768/api/errors/${editingError.id}`
-        : "http://localhost:8768/api/errors";
+        ? `${API_BASE_URL}/api/errors/${editingError.id}`
+        : `${API_BASE_URL}/api/errors`;
       const method = editingError ? "PUT" : "POST";
 
       const response = await fetch(url, {
@@ -91,11 +174,20 @@ const Index = () => {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const updatedError = await response.json();
+      let updatedError = await response.json();
+      const duplicates: SimilarError[] = updatedError.duplicates ?? [];
+      if (largeFiles.length > 0) {
+        for (const file of largeFiles) {
+          await uploadFileChunked(file, updatedError.id);
+        }
+        const refreshed = await fetch(`${API_BASE_URL}/api/errors/${updatedError.id}`);
+        if (!refreshed.ok) throw new Error(`HTTP error! status: ${refreshed.status}`);
+        updatedError = await refreshed.json();
+      }
       setErrors((prev) =>
         editingError
           ? prev.map((error) => (error.id === editingError.id ? updatedError : error))
-          : [updatedError, ...prev]
+          : [updatedError, ...prev.filter((error) => error.id !== updatedError.id)]
       );
 
       toast({
@@ -105,7 +197,16 @@ const Index = () => {
           : "A new error entry has been created successfully.",
         variant: "default",
       });
+      if (duplicates.length > 0) {
+        toast({
+          title: "Possible duplicate",
+          description: `Similar to: ${duplicates
+            .map((d) => `"${d.title}" (${Math.round(d.score * 100)}%)`)
+            .join(", ")}`,
+        });
+      }
 
+      fetchStats();
       setView("list");
       setEditingError(null);
     } catch (error: any) {
@@ -117,6 +218,8 @@ const Index = () => {
     }
   };
 
+  const noFilters = severityFilter === "all" && statusFilter === "all" && searchTerm === "";
+
   if (view === "form") {
     return (
       <div className="min-h-screen bg-background p-6">
@@ -176,7 +279,12 @@ const Index = () => {
             </div>
             <div className="flex gap-3">
               <Button
-                onClick={() => exportToWord(toast)}
+                onClick={() =>
+                  exportToWord(toast, {
+                    severity: severityFilter !== "all" ? severityFilter : undefined,
+                    status: statusFilter !== "all" ? statusFilter : undefined,
+                  })
+                }
                 variant="outline"
                 className="gap-2"
                 disabled={errors.length === 0}
@@ -236,27 +344,27 @@ const Index = () => {
         </div>
 
         {/* Stats */}
-        {errors.length > 0 && (
+        {stats && stats.total > 0 && (
           <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
             <div className="bg-gradient-card border border-border/50 rounded-lg p-4">
-              <div className="text-2xl font-bold text-foreground">{errors.length}</div>
+              <div className="text-2xl font-bold text-foreground">{stats.total}</div>
               <div className="text-sm text-muted-foreground">Total Errors</div>
             </div>
             <div className="bg-gradient-card border border-border/50 rounded-lg p-4">
               <div className="text-2xl font-bold text-critical">
-                {errors.filter((e) => e.severity === "critical").length}
+                {stats.by_severity.critical ?? 0}
               </div>
               <div className="text-sm text-muted-foreground">Critical</div>
             </div>
             <div className="bg-gradient-card border border-border/50 rounded-lg p-4">
               <div className="text-2xl font-bold text-warning">
-                {errors.filter((e) => e.status === "in-progress").length}
+                {stats.by_status["in-progress"] ?? 0}
               </div>
               <div className="text-sm text-muted-foreground">In Progress</div>
             </div>
             <div className="bg-gradient-card border border-border/50 rounded-lg p-4">
               <div className="text-2xl font-bold text-success">
-                {errors.filter((e) => e.status === "resolved").length}
+                {stats.by_status.resolved ?? 0}
               </div>
               <div className="text-sm text-muted-foreground">Resolved</div>
             </div>
@@ -264,30 +372,18 @@ const Index = () => {
         )}
 
         {/* Error List */}
-        {errors.filter(
-          (error) =>
-            (severityFilter === "all" || error.severity === severityFilter) &&
-            (statusFilter === "all" || error.status === statusFilter) &&
-            (searchTerm === "" ||
-              error.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-              error.description.toLowerCase().includes(searchTerm.toLowerCase()) ||
-              (error.category &&
-                error.category.toLowerCase().includes(searchTerm.toLowerCase())) ||
-              error.tags.some((tag) =>
-                tag.toLowerCase().includes(searchTerm.toLowerCase())
-              ))
-        ).length === 0 ? (
+        {errors.length === 0 ? (
           <div className="text-center py-12">
             <Bug className="h-16 w-16 mx-auto text-muted-foreground mb-4" />
             <h3 className="text-xl font-semibold text-foreground mb-2">
-              {errors.length === 0 ? "No errors logged yet" : "No errors match your filters"}
+              {noFilters ? "No errors logged yet" : "No errors match your filters"}
             </h3>
             <p className="text-muted-foreground mb-6">
-              {errors.length === 0
+              {noFilters
                 ? "Start by adding your first error entry to begin tracking and resolving issues."
                 : "Try adjusting your search terms or filters to find what you're looking for."}
             </p>
-            {errors.length === 0 && (
+            {noFilters && (
               <Button
                 onClick={() => setView("form")}
                 className="bg-gradient-primary"
@@ -299,34 +395,28 @@ const Index = () => {
           </div>
         ) : (
           <div className="grid grid-cols-1 lg:grid-cols-3 gap-4">
-            {errors
-              .filter(
-                (error) =>
-                  (severityFilter === "all" || error.severity === severityFilter) &&
-                  (statusFilter === "all" || error.status === statusFilter) &&
-                  (searchTerm === "" ||
-                    error.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                    error.description.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                    (error.category &&
-                      error.category.toLowerCase().includes(searchTerm.toLowerCase())) ||
-                    error.tags.some((tag) =>
-                      tag.toLowerCase().includes(searchTerm.toLowerCase())
-                    ))
-              )
-              .map((error) => (
-                <ErrorCard
-                  key={error.id}
-                  error={error}
-                  onEdit={() => {
-                    setEditingError(error);
-                    setView("form");
-                  }}
-                  onView={() => {
-                    setSelectedError(error);
-                    setView("details");
-                  }}
-                />
-              ))}
+            {errors.map((error) => (
+              <ErrorCard
+                key={error.id}
+                error={error}
+                onEdit={() => {
+                  setEditingError(error);
+                  setView("form");
+                }}
+                onView={() => {
+                  setSelectedError(error);
+                  setView("details");
+                }}
+              />
+            ))}
+          </div>
+        )}
+
+        {hasMore && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={() => fetchErrors(nextCursor)}>
+              Load More
+            </Button>
           </div>
         )}
       </div>
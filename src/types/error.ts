@@ -16,4 +16,35 @@ export interface ErrorEntry {
     size: number;
     mimetype: string;
   }[];
-}
\ No newline at end of file
+}
+
+export interface ErrorPage {
+  items: ErrorEntry[];
+  next_cursor: string | null;
+  has_more: boolean;
+}
+export interface ErrorStats {
+  total: number;
+  by_severity: Record<string, number>;
+  by_status: Record<string, number>;
+  by_category: Record<string, number>;
+  top_tags: { tag: string; count: number }[];
+  daily: { date: string; opened: number; resolved: number }[];
+  mean_time_to_resolution_hours: number | null;
+}
+
+export interface ErrorChange {
+  type: 'created' | 'updated' | 'file_attached' | 'deleted' | 'removed';
+  id: string;
+  version: number;
+  error: ErrorEntry | null;
+}
+
+export interface SimilarError {
+  id: string;
+  title: string;
+  severity: ErrorEntry['severity'];
+  status: ErrorEntry['status'];
+  created_at: string;
+  score: number;
+}
@@ -0,0 +1,7 @@
+// The desktop window and the Vite dev server load the UI from port 7641 and call the API on 8768.
+// The headless server (backend/server.py) serves the UI itself, so requests stay on the page's origin.
+const DESKTOP_UI_PORT = "7641";
+
+export const API_BASE_URL: string =
+  import.meta.env.VITE_API_BASE_URL ??
+  (window.location.port === DESKTOP_UI_PORT || window.location.protocol === "file:" ? "http://localhost:8768" : "");
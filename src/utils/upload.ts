@@ -0,0 +1,85 @@
+import { API_BASE_URL } from "@/utils/api";
+
+// Files above this size are sent through the resumable chunked upload API
+export const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+const MAX_CHUNK_RETRIES = 5;
+
+interface UploadSession {
+  id: string;
+  size: number;
+  received: number;
+  complete: boolean;
+  chunk_size: number;
+}
+
+const sha256Hex = async (data: ArrayBuffer) => {
+  const digest = await crypto.subtle.digest("SHA-256", data);
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+};
+
+const getSession = async (uploadId: string): Promise<UploadSession> => {
+  const response = await fetch(`${API_BASE_URL}/api/uploads/${uploadId}`);
+  if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+  return response.json();
+};
+
+/**
+ * Upload a file in checksummed chunks, resuming from the server's offset after
+ * failures, and attach it to the given error once complete.
+ */
+export const uploadFileChunked = async (
+  file: File,
+  errorId: string,
+  onProgress?: (received: number, total: number) => void
+) => {
+  const createResponse = await fetch(`${API_BASE_URL}/api/uploads`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({
+      filename: file.name,
+      size: file.size,
+      mimetype: file.type || "application/octet-stream",
+    }),
+  });
+  if (!createResponse.ok) throw new Error(`HTTP error! status: ${createResponse.status}`);
+  let session: UploadSession = await createResponse.json();
+
+  let retries = 0;
+  while (!session.complete) {
+    const chunk = await file.slice(session.received, session.received + session.chunk_size).arrayBuffer();
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/uploads/${session.id}`, {
+        method: "PATCH",
+        headers: {
+          "Upload-Offset": String(session.received),
+          "X-Chunk-SHA256": await sha256Hex(chunk),
+          "Content-Type": "application/octet-stream",
+        },
+        body: chunk,
+      });
+      if (response.status === 409) {
+        // Out of step with the server; continue from the offset it has
+        session = await getSession(session.id);
+        continue;
+      }
+      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+      session = await response.json();
+      retries = 0;
+      onProgress?.(session.received, session.size);
+    } catch (error) {
+      if (++retries > MAX_CHUNK_RETRIES) throw error;
+      await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** retries));
+      session = await getSession(session.id);
+    }
+  }
+
+  const attachResponse = await fetch(`${API_BASE_URL}/api/errors/${errorId}/files`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ upload_id: session.id }),
+  });
+  if (!attachResponse.ok) throw new Error(`HTTP error! status: ${attachResponse.status}`);
+  return attachResponse.json();
+};
@@ -1,42 +1,94 @@
-import { ErrorEntry } from "@/types/error";
+import { API_BASE_URL } from "@/utils/api";
 
 type Toast = { title: string; description?: string; variant?: string };
 
-export const exportToWord = async (toast: ({ title, description, variant }: Toast) => void) => {
-  try {
-    // Fetch Word document from backend
-    const response = await fetch('http://localhost8768/api/export/word', {
-      method: 'GET',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-    });
+const POLL_INTERVAL_MS = 1000;
+
+interface ExportJob {
+  job_id: string;
+  status: "queued" | "running" | "completed" | "failed";
+  processed: number;
+  total: number | null;
+  filename: string;
+  error: string | null;
+  status_url: string;
+  download_url: string;
+}
+
+const saveBlob = (blob: Blob, filename: string) => {
+  const url = window.URL.createObjectURL(blob);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = filename;
+  document.body.appendChild(link);
+  link.click();
+  document.body.removeChild(link);
+  window.URL.revokeObjectURL(url);
+};
 
+const filenameFromResponse = (response: Response, fallback: string) => {
+  const disposition = response.headers.get('Content-Disposition') || '';
+  const match = disposition.match(/filename\*?=(?:UTF-8'')?"?([^";]+)"?/i);
+  return match ? decodeURIComponent(match[1]) : fallback;
+};
+
+// Large exports run as a background job on the server; poll until the document is ready
+const waitForJob = async (job: ExportJob): Promise<ExportJob> => {
+  let current = job;
+  while (current.status === "queued" || current.status === "running") {
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    const response = await fetch(`${API_BASE_URL}${current.status_url}`);
     if (!response.ok) {
       throw new Error(`HTTP error! Status: ${response.status}`);
     }
+    current = await response.json();
+  }
+  if (current.status === "failed") {
+    throw new Error(current.error || "Export job failed");
+  }
+  return current;
+};
 
-    const data = await response.json();
-    const { filename, content, mimetype } = data;
+export interface ExportFilters {
+  severity?: string;
+  status?: string;
+  category?: string;
+  tag?: string;
+  created_from?: string;
+  created_to?: string;
+  updated_since?: string;
+}
 
-    // Convert base64 to binary
-    const byteCharacters = atob(content);
-    const byteNumbers = new Array(byteCharacters.length);
-    for (let i = 0; i < byteCharacters.length; i++) {
-      byteNumbers[i] = byteCharacters.charCodeAt(i);
+export const exportToWord = async (
+  toast: ({ title, description, variant }: Toast) => void,
+  filters: ExportFilters = {}
+) => {
+  try {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value) params.set(key, value);
+    });
+    const query = params.toString();
+    let response = await fetch(`${API_BASE_URL}/api/export/word${query ? `?${query}` : ""}`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! Status: ${response.status}`);
     }
-    const byteArray = new Uint8Array(byteNumbers);
-
-    // Create Blob and trigger download
-    const blob = new Blob([byteArray], { type: mimetype });
-    const url = window.URL.createObjectURL(blob);
-    const link = document.createElement('a');
-    link.href = url;
-    link.download = filename;
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
-    window.URL.revokeObjectURL(url);
+
+    let fallbackName = `Error_Log_Export_${new Date().toISOString().slice(0, 10)}.docx`;
+    if (response.status === 202) {
+      toast({
+        title: "Export Started",
+        description: "The report is large and is being generated in the background.",
+      });
+      const job = await waitForJob(await response.json());
+      fallbackName = job.filename;
+      response = await fetch(`${API_BASE_URL}${job.download_url}`);
+      if (!response.ok) {
+        throw new Error(`HTTP error! Status: ${response.status}`);
+      }
+    }
+
+    saveBlob(await response.blob(), filenameFromResponse(response, fallbackName));
 
     toast({
       title: "Success",
@@ -49,4 +101,4 @@ export const exportToWord = async (toast: ({ title, description, variant }: Toas
       variant: "destructive",
     });
   }
-};
\ No newline at end of file
+};